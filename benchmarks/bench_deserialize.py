@@ -0,0 +1,81 @@
+"""
+Compare per-response CPU time of the generic and fast-path deserializers.
+
+    uv run python benchmarks/bench_deserialize.py [iterations]
+"""
+import json
+import sys
+import time
+
+import httpx
+
+from mcp_server_gravatar.async_api_client import AsyncApiClient, _json_loads
+from mcp_server_gravatar.async_rest import AsyncRESTResponse
+
+AVATAR = {
+    "image_id": "6f3eac1c67f970f2a0c2ea8",
+    "image_url": "https://2.gravatar.com/userimage/133992/6f3eac1c67f970f2a0c2ea8",
+    "rating": "G",
+    "alt_text": "Gravatar's avatar image.",
+    "selected": True,
+    "updated_date": "2024-09-18T10:17:53Z",
+}
+
+PROFILE = {
+    "hash": "31c5543c1734d25c7206f5fd591525d0295bec6fe84ff82f946a34fe970a1e66",
+    "display_name": "Alex Morgan",
+    "profile_url": "https://gravatar.com/example",
+    "avatar_url": "https://0.gravatar.com/avatar/31c5543c1734d25c7206f5fd591525d0",
+    "avatar_alt_text": "Alex Morgan's avatar",
+    "location": "New York, USA",
+    "description": "I like playing hide and seek.",
+    "job_title": "Landscape Architect",
+    "company": "ACME Corp",
+    "verified_accounts": [
+        {
+            "service_type": "mastodon",
+            "service_label": "Mastodon",
+            "service_icon": "https://gravatar.com/icons/mastodon.svg",
+            "url": "https://mastodon.social/@example",
+            "is_hidden": False,
+        }
+    ] * 5,
+    "pronunciation": "Al-ex Mor-gan",
+    "pronouns": "she/her",
+}
+
+CASES = [
+    ("List[Avatar] x20", "List[Avatar]", [AVATAR] * 20),
+    ("object (profile)", "object", PROFILE),
+]
+
+
+def bench(client: AsyncApiClient, response_type: str, body: bytes, iterations: int) -> float:
+    response = AsyncRESTResponse(httpx.Response(
+        200, content=body, headers={"content-type": "application/json; charset=utf-8"}))
+    response.data = body
+    types_map = {"200": response_type}
+    start = time.process_time()
+    for _ in range(iterations):
+        client.response_deserialize(response, types_map)
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print(f"json parser: {_json_loads.__module__}.{_json_loads.__name__}")
+    client = AsyncApiClient()
+    for label, response_type, payload in CASES:
+        body = json.dumps(payload).encode("utf-8")
+        client.fast_deserialize = False
+        before = bench(client, response_type, body, iterations)
+        client.fast_deserialize = True
+        after = bench(client, response_type, body, iterations)
+        print(
+            f"{label:<20} generic {before * 1e6:8.1f} us  "
+            f"fast {after * 1e6:8.1f} us  ({before / after:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Compare the urllib3 REST client with the httpx async client over HTTP/1.1 and
+HTTP/2, at 1, 10 and 100 concurrent requests.
+
+    uv run --extra http2 python benchmarks/bench_transport.py [url] [requests]
+
+The default URL is a profile on the Gravatar API; set GRAVATAR_API_TOKEN to
+authenticate, and GRAVATAR_SSL_CA_CERT to trust a test server's certificate.
+Each transport sends `requests` requests (default 100) per concurrency level,
+so mind the rate limit, or point the benchmark at a local HTTP/2 server.
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpcore
+from urllib3.util.request import ACCEPT_ENCODING
+
+from mcp_server_gravatar.async_rest import AsyncRESTClientObject
+from openapi_client.configuration import Configuration
+from openapi_client.rest import RESTClientObject
+
+DEFAULT_URL = (
+    "https://api.gravatar.com/v3/profiles/"
+    "31c5543c1734d25c7206f5fd591525d0295bec6fe84ff82f946a34fe970a1e66"
+)
+CONCURRENCY = (1, 10, 100)
+
+
+class _CountingBackend(httpcore.AsyncNetworkBackend):
+    """Counts the TCP connections the httpx client opens."""
+
+    def __init__(self):
+        self._backend = httpcore.AnyIOBackend()
+        self.connections = 0
+
+    async def connect_tcp(self, *args, **kwargs):
+        self.connections += 1
+        return await self._backend.connect_tcp(*args, **kwargs)
+
+    async def connect_unix_socket(self, *args, **kwargs):
+        return await self._backend.connect_unix_socket(*args, **kwargs)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+def _configuration() -> Configuration:
+    config = Configuration()
+    config.access_token = os.environ.get("GRAVATAR_API_TOKEN")
+    # e.g. the certificate of a local test server
+    config.ssl_ca_cert = os.environ.get("GRAVATAR_SSL_CA_CERT") or None
+    return config
+
+
+def _headers(config: Configuration) -> dict:
+    headers = {"Accept": "application/json"}
+    if config.access_token:
+        headers["Authorization"] = f"Bearer {config.access_token}"
+    return headers
+
+
+def bench_urllib3(url: str, concurrency: int, requests: int) -> tuple[list[float], float, int]:
+    config = _configuration()
+    client = RESTClientObject(config)
+    # The httpx client asks for compressed responses itself
+    headers = {**_headers(config), "Accept-Encoding": ACCEPT_ENCODING}
+
+    def fetch() -> float:
+        start = time.perf_counter()
+        response = client.request("GET", url, headers=headers)
+        response.read()
+        return time.perf_counter() - start
+
+    fetch()
+    # Blocking clients get their concurrency from threads
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        latencies = list(pool.map(lambda _: fetch(), range(requests)))
+        elapsed = time.perf_counter() - start
+    pools = client.pool_manager.pools
+    connections = sum(pools[key].num_connections for key in pools.keys())
+    client.pool_manager.clear()
+    return latencies, elapsed, connections
+
+
+async def bench_httpx(
+    url: str, concurrency: int, requests: int, http2: bool
+) -> tuple[list[float], float, int]:
+    config = _configuration()
+    backend = _CountingBackend()
+    client = AsyncRESTClientObject(config, http2=http2, network_backend=backend)
+    headers = _headers(config)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch() -> float:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request("GET", url, headers=headers)
+            await response.read()
+            return time.perf_counter() - start
+
+    try:
+        await fetch()
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(fetch() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.close()
+    return latencies, elapsed, backend.connections
+
+
+def report(label: str, concurrency: int, result: tuple[list[float], float, int]) -> None:
+    latencies, elapsed, connections = result
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+    print(
+        f"{label:<14} {concurrency:>4}  {len(latencies) / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies) * 1000:7.1f} ms  p95 {p95 * 1000:7.1f} ms  "
+        f"{connections:>4} connections"
+    )
+
+
+def main() -> None:
+    url = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_URL
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    # urllib3 warns whenever it discards a connection beyond the pool size
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+    http2 = importlib.util.find_spec("h2") is not None
+    if not http2:
+        print("h2 is not installed; skipping HTTP/2 (install the 'http2' extra)")
+    print(f"{requests} requests per level to {url}")
+    print(f"{'transport':<14} {'conc':>4}")
+    for concurrency in CONCURRENCY:
+        report("urllib3", concurrency, bench_urllib3(url, concurrency, requests))
+        report("httpx HTTP/1.1", concurrency,
+               asyncio.run(bench_httpx(url, concurrency, requests, http2=False)))
+        if http2:
+            report("httpx HTTP/2", concurrency,
+                   asyncio.run(bench_httpx(url, concurrency, requests, http2=True)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Rewrite the generated package `__init__` modules to import lazily.
+
+The generator emits `from openapi_client.x import Y` for every API class and
+model, so importing any submodule (e.g. `openapi_client.exceptions`) loads the
+whole client. This turns those imports into a name -> module table resolved
+on first attribute access, and keeps them under TYPE_CHECKING for type
+checkers. `make generate` runs it after syncing the generated code; running it
+again on its own output changes nothing.
+
+    python scripts/lazy_imports.py src/openapi_client/__init__.py ...
+"""
+import re
+import sys
+
+IMPORT_RE = re.compile(r"^\s*from (openapi_client\.[\w.]+) import (\w+)\s*$")
+# The first line that is not part of the generated header
+BODY_RE = re.compile(r"^(# import |import importlib|from openapi_client\.)")
+
+TEMPLATE = '''\
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported on first access, so importing the package (e.g. for a single
+# submodule) does not load every API class and model
+_EXPORTS = {{
+{exports}
+}}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+{imports}
+'''
+
+
+def rewrite(source: str) -> str:
+    lines = source.splitlines()
+    start = next(i for i, line in enumerate(lines) if BODY_RE.match(line))
+    header = "\n".join(lines[:start]).rstrip()
+    names = {}
+    for line in lines[start:]:
+        match = IMPORT_RE.match(line)
+        if match:
+            names.setdefault(match.group(2), match.group(1))
+    exports = "\n".join(f'    "{name}": "{module}",' for name, module in names.items())
+    imports = "\n".join(f"    from {module} import {name}" for name, module in names.items())
+    return header + "\n\n" + TEMPLATE.format(exports=exports, imports=imports)
+
+
+def main() -> None:
+    for path in sys.argv[1:]:
+        with open(path) as f:
+            source = f.read()
+        with open(path, "w") as f:
+            f.write(rewrite(source))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
 import click
-from .gravatar import serve
 
 
 @click.command()
-def main():
-    import asyncio
+@click.option(
+    "--transport",
+    type=click.Choice(["stdio", "sse"]),
+    default="stdio",
+    show_default=True,
+    help="Serve a single client over stdio, or many clients over SSE.",
+)
+@click.option("--host", default="127.0.0.1", show_default=True,
+              help="Interface to bind for the sse transport.")
+@click.option("--port", type=int, default=8000, show_default=True,
+              help="Port to bind for the sse transport.")
+@click.option("--profile-startup", is_flag=True,
+              help="Print an import-time breakdown of server startup to stderr and exit.")
+def main(transport: str, host: str, port: int, profile_startup: bool):
+    if profile_startup:
+        from .startup_profile import report
 
-    asyncio.run(serve())
+        report()
+        return
+    # Imported here so the flags above are handled before the server loads
+    from .gravatar import serve
+
+    serve(transport=transport, host=host, port=port)
 
 
 if __name__ == "__main__":
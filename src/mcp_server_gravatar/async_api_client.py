@@ -0,0 +1,208 @@
+import functools
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, TypeAdapter
+
+import openapi_client.models
+from openapi_client.api_client import ApiClient
+from openapi_client.api_response import ApiResponse
+
+from . import async_rest
+
+try:
+    # Optional faster JSON parser; accepts bytes directly
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+_JSON_MIME_RE = re.compile(r'^application/(json|[\w!#$&.+-^_]+\+json)\s*(;|$)', re.IGNORECASE)
+_CHARSET_RE = re.compile(r"charset=([a-zA-Z\-\d]+)[\s;]?")
+_LIST_TYPE_RE = re.compile(r'List\[(.*)]')
+_DICT_TYPE_RE = re.compile(r'Dict\[([^,]*), (.*)]')
+# Leaf values that cannot contain models
+_SCALARS = frozenset({type(None), str, int, float, bool})
+
+
+@functools.lru_cache(maxsize=64)
+def _is_utf8_json(content_type: Optional[str]) -> bool:
+    """Whether a response with this content type can be validated from raw bytes."""
+    if content_type is None or not _JSON_MIME_RE.match(content_type):
+        return False
+    match = _CHARSET_RE.search(content_type)
+    return match is None or match.group(1).lower() in ("utf-8", "utf8")
+
+
+def _type_annotation(klass: str) -> Any:
+    """Returns a pydantic-validatable annotation for an OpenAPI type string,
+    or None if it contains types that need the generated deserialization rules.
+    """
+    if klass.startswith('List['):
+        m = _LIST_TYPE_RE.match(klass)
+        item = _type_annotation(m.group(1)) if m else None
+        return None if item is None else List[item]
+    if klass.startswith('Dict['):
+        m = _DICT_TYPE_RE.match(klass)
+        value = _type_annotation(m.group(2)) if m else None
+        return None if value is None else Dict[str, value]
+    model = getattr(openapi_client.models, klass, None)
+    if isinstance(model, type) and issubclass(model, BaseModel):
+        return model
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _field_names(cls: type) -> Optional[frozenset]:
+    """The field names of a model class, or None for other types."""
+    if isinstance(cls, type) and issubclass(cls, BaseModel):
+        return frozenset(cls.model_fields)
+    return None
+
+
+def _mark_fields_set(value: Any) -> None:
+    """Mark every field of the models in `value` as set, as `from_dict` does.
+
+    The generated `from_dict` passes every field, with None for missing
+    ones, so dumps with `exclude_unset=True` still include them.
+    """
+    cls = type(value)
+    if cls is list:
+        for item in value:
+            _mark_fields_set(item)
+    elif cls is dict:
+        for item in value.values():
+            _mark_fields_set(item)
+    elif cls not in _SCALARS:
+        names = _field_names(cls)
+        if names is not None:
+            object.__setattr__(value, "__pydantic_fields_set__", set(names))
+            for item in value.__dict__.values():
+                _mark_fields_set(item)
+
+
+def _validate_json(adapter: TypeAdapter, raw: bytes) -> Any:
+    value = adapter.validate_json(raw)
+    _mark_fields_set(value)
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _json_deserializer(response_type: str) -> Optional[Callable[[bytes], Any]]:
+    """Returns a callable deserializing a raw JSON body of `response_type`,
+    or None if the generated rules have to handle it.
+
+    Model types (and lists/dicts of them) are validated straight from the
+    bytes by pydantic, and 'object' bodies are only parsed.
+    """
+    if response_type == 'object':
+        return _json_loads
+    annotation = _type_annotation(response_type)
+    if annotation is None:
+        return None
+    return functools.partial(_validate_json, TypeAdapter(annotation))
+
+
+class AsyncApiClient(ApiClient):
+    """Generated ApiClient whose transport is asyncio-native.
+
+    Request serialization and response deserialization are inherited from
+    `ApiClient`; only `call_api` differs, and it must be awaited. The returned
+    `AsyncRESTResponse` must also have `await response.read()` called on it
+    before it is passed to `response_deserialize`.
+
+    The generated `*Api` classes call `call_api` synchronously, so with this
+    client they can only be used for their `_<operation>_serialize` helpers.
+
+    :param configuration: .Configuration object for this client
+    :param header_name: a header to pass when making calls to the API.
+    :param header_value: a header value to pass when making calls to
+        the API.
+    :param cookie: a cookie to include in the header when making calls
+        to the API
+    :param http2: negotiate HTTP/2 (see `AsyncRESTClientObject`)
+    :param network_backend: httpcore network backend for new connections
+    """
+
+    def __init__(
+        self, configuration=None, *args, http2=False, network_backend=None, **kwargs
+    ) -> None:
+        super().__init__(configuration, *args, **kwargs)
+        self._transport_args = {"http2": http2, "network_backend": network_backend}
+        # The generated client builds a urllib3 transport; swap in httpx
+        self.rest_client = async_rest.AsyncRESTClientObject(
+            self.configuration, **self._transport_args)
+        # Deserialize successful JSON bodies straight from bytes
+        self.fast_deserialize = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """Closes pooled connections; later calls open a new pool."""
+        rest_client = self.rest_client
+        self.rest_client = async_rest.AsyncRESTClientObject(
+            self.configuration, **self._transport_args)
+        await rest_client.close()
+
+    async def call_api(
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ) -> async_rest.AsyncRESTResponse:
+        """Makes the HTTP request (asynchronous)
+        :param method: Method to call.
+        :param url: Path to method endpoint.
+        :param header_params: Header parameters to be
+            placed in the request header.
+        :param body: Request body.
+        :param post_params dict: Request post form parameters,
+            for `application/x-www-form-urlencoded`, `multipart/form-data`.
+        :param _request_timeout: timeout setting for this request.
+        :return: AsyncRESTResponse
+        """
+
+        return await self.rest_client.request(
+            method, url,
+            headers=header_params,
+            body=body, post_params=post_params,
+            _request_timeout=_request_timeout
+        )
+
+    def response_deserialize(self, response_data, response_types_map=None) -> ApiResponse:
+        """Deserializes response into an object.
+
+        Successful JSON responses of model types skip the decode-parse-
+        `from_dict` round trip of the generated client, with the same result;
+        everything else is handled by it.
+
+        :param response_data: AsyncRESTResponse object to be deserialized.
+        :param response_types_map: dict of response types.
+        :return: ApiResponse
+        """
+        status = response_data.status
+        if (
+            self.fast_deserialize
+            and isinstance(status, int) and 200 <= status <= 299
+            and response_data.data
+            and _is_utf8_json(response_data.getheader('content-type'))
+        ):
+            response_type = response_types_map.get(str(status)) or response_types_map.get(
+                str(status)[0] + "XX")
+            deserializer = _json_deserializer(response_type) if response_type else None
+            if deserializer is not None:
+                return ApiResponse(
+                    status_code=status,
+                    data=deserializer(response_data.data),
+                    headers=response_data.getheaders(),
+                    raw_data=response_data.data,
+                )
+        return super().response_deserialize(response_data, response_types_map)
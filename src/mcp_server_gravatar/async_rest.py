@@ -0,0 +1,233 @@
+import importlib.util
+import io
+import json
+import re
+import ssl
+
+import httpx
+
+from openapi_client.exceptions import ApiException, ApiValueError
+
+from .tls import ssl_context
+
+RESTResponseType = httpx.Response
+
+
+def _accept_encoding() -> str:
+    """Content codings httpx can decode with the installed packages, best first."""
+    codings = []
+    if importlib.util.find_spec("zstandard") is not None:
+        codings.append("zstd")
+    if (
+        importlib.util.find_spec("brotli") is not None
+        or importlib.util.find_spec("brotlicffi") is not None
+    ):
+        codings.append("br")
+    return ", ".join(codings + ["gzip", "deflate"])
+
+
+ACCEPT_ENCODING = _accept_encoding()
+
+
+class AsyncRESTResponse(io.IOBase):
+
+    def __init__(self, resp) -> None:
+        self.response = resp
+        self.status = resp.status_code
+        self.reason = resp.reason_phrase
+        self.data = None
+
+    async def read(self):
+        if self.data is None:
+            self.data = await self.response.aread()
+        return self.data
+
+    def getheaders(self):
+        """Returns a dictionary of the response headers."""
+        return self.response.headers
+
+    def getheader(self, name, default=None):
+        """Returns a given response header."""
+        return self.response.headers.get(name, default)
+
+
+class AsyncRESTClientObject:
+    """
+    asyncio-native counterpart of the generated `openapi_client.rest.RESTClientObject`,
+    built on httpx instead of urllib3.
+
+    It lives outside the generated package so that regenerating the client
+    (`make generate`) does not remove it.
+
+    :param configuration: .Configuration object for this client
+    :param http2: negotiate HTTP/2, which requires the h2 package. Concurrent
+        requests to a host are then multiplexed over one connection.
+    :param network_backend: httpcore network backend used to open
+        connections, e.g. to cache DNS lookups
+    """
+
+    def __init__(self, configuration, http2=False, network_backend=None) -> None:
+        # httpx.AsyncClient keeps its own connection pool; a single instance
+        # is shared by every request made through this object.
+        # https://www.python-httpx.org/advanced/clients/
+
+        if configuration.verify_ssl:
+            # Shared with every other client built with the same settings
+            verify = ssl_context(configuration)
+        else:
+            verify = False
+
+        transport_args = {
+            "verify": verify,
+            "http2": http2,
+            # urllib3's pool size only bounds the connections kept alive; more
+            # are opened under load, so concurrent requests are not capped here
+            "limits": httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=configuration.connection_pool_maxsize,
+            ),
+        }
+        if configuration.retries is not None:
+            transport_args["retries"] = configuration.retries
+
+        if configuration.socket_options is not None:
+            transport_args["socket_options"] = configuration.socket_options
+
+        if configuration.proxy:
+            transport_args["proxy"] = httpx.Proxy(
+                configuration.proxy,
+                headers=configuration.proxy_headers,
+            )
+
+        self.transport = httpx.AsyncHTTPTransport(**transport_args)
+        if network_backend is not None:
+            # httpx does not expose httpcore's network_backend option
+            self.transport._pool._network_backend = network_backend
+
+        self.pool_manager = httpx.AsyncClient(
+            transport=self.transport,
+            timeout=None,
+        )
+
+    async def close(self) -> None:
+        await self.pool_manager.aclose()
+
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Perform requests.
+
+        :param method: http request method
+        :param url: http request url
+        :param headers: http request headers
+        :param body: request json body, for `application/json`
+        :param post_params: request post parameters,
+                            `application/x-www-form-urlencoded`
+                            and `multipart/form-data`
+        :param _request_timeout: timeout setting for this request. If one
+                                 number provided, it will be total request
+                                 timeout. It can also be a pair (tuple) of
+                                 (connection, read) timeouts.
+        """
+        method = method.upper()
+        assert method in [
+            'GET',
+            'HEAD',
+            'DELETE',
+            'POST',
+            'PUT',
+            'PATCH',
+            'OPTIONS'
+        ]
+
+        if post_params and body:
+            raise ApiValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or {}
+        headers = headers or {}
+        # httpx decodes compressed bodies chunk by chunk as they stream in
+        headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+
+        timeout = httpx.USE_CLIENT_DEFAULT
+        if _request_timeout:
+            if isinstance(_request_timeout, (int, float)):
+                timeout = httpx.Timeout(_request_timeout)
+            elif (
+                    isinstance(_request_timeout, tuple)
+                    and len(_request_timeout) == 2
+                ):
+                timeout = httpx.Timeout(
+                    None,
+                    connect=_request_timeout[0],
+                    read=_request_timeout[1]
+                )
+
+        args = {
+            "method": method,
+            "url": url,
+            "timeout": timeout,
+            "headers": headers,
+        }
+
+        # For `POST`, `PUT`, `PATCH`, `OPTIONS`, `DELETE`
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+
+            # no content type provided or payload is json
+            content_type = headers.get('Content-Type')
+            if (
+                not content_type
+                or re.search('json', content_type, re.IGNORECASE)
+            ):
+                if body is not None:
+                    args["content"] = json.dumps(body)
+            elif content_type == 'application/x-www-form-urlencoded':
+                args["data"] = dict(post_params)
+            elif content_type == 'multipart/form-data':
+                # must del headers['Content-Type'], or the correct
+                # Content-Type which generated by httpx will be
+                # overwritten.
+                del headers['Content-Type']
+                data = {}
+                files = []
+                for k, v in post_params:
+                    if isinstance(v, tuple):
+                        files.append((k, v))
+                    elif isinstance(v, dict):
+                        # Ensures that dict objects are serialized
+                        data[k] = json.dumps(v)
+                    else:
+                        data[k] = v
+                args["data"] = data
+                args["files"] = files
+            # Pass a `string` parameter directly in the body to support
+            # other content types than JSON when `body` argument is
+            # provided in serialized form.
+            elif isinstance(body, str) or isinstance(body, bytes):
+                args["content"] = body
+            elif content_type.startswith('text/') and isinstance(body, bool):
+                args["content"] = "true" if body else "false"
+            else:
+                # Cannot generate the request from given parameters
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        try:
+            request = self.pool_manager.build_request(**args)
+            r = await self.pool_manager.send(request, stream=True)
+        except httpx.ConnectError as e:
+            if isinstance(e.__context__, ssl.SSLError):
+                msg = "\n".join([type(e.__context__).__name__, str(e)])
+                raise ApiException(status=0, reason=msg)
+            raise
+
+        return AsyncRESTResponse(r)
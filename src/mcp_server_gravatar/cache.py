@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+# Returned by TTLCache.get when a key is absent or expired
+MISSING = object()
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    expires_at: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class StalePolicy:
+    """
+    How long past its expiry a cached entry may still be served.
+
+    Within `stale_while_revalidate` seconds the stale entry is returned at once
+    and refreshed in the background. Within `stale_if_error` seconds it is
+    returned when the refresh fails with a server error, rate limiting or a
+    network error.
+    """
+    stale_while_revalidate: float = 0.0
+    stale_if_error: float = 0.0
+
+    def serve_while_revalidating(self, staleness: float) -> bool:
+        return 0 <= staleness <= self.stale_while_revalidate
+
+    def serve_on_error(self, staleness: float) -> bool:
+        return 0 <= staleness <= self.stale_if_error
+
+
+class TTLCache:
+    """
+    Bounded in-memory cache with a per-entry TTL and least-recently-used eviction.
+
+    Expired entries are not served by `get`, but stay available through `peek`
+    (e.g. for revalidation) until they are overwritten or evicted.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Return the cached value for `key`, or `MISSING` if it is absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= self._clock():
+            return MISSING
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def peek(self, key: Hashable) -> Optional[CacheEntry]:
+        """
+        Return the entry for `key` even if expired, without touching LRU order.
+        """
+        return self._entries.get(key)
+
+    def staleness(self, entry: CacheEntry) -> float:
+        """
+        Return how many seconds ago `entry` expired (negative while fresh).
+        """
+        return self._clock() - entry.expires_at
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, **metadata: Any) -> None:
+        """
+        Store `value` under `key`, evicting the least recently used entries if full.
+        """
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        self._entries[key] = CacheEntry(
+            value=value, expires_at=self._clock() + ttl, metadata=metadata)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,351 @@
+import abc
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedEntry:
+    """
+    A JSON-serializable cache record shared between server processes.
+
+    `expires_at` is a Unix timestamp, since monotonic clocks are per-process.
+    """
+    value: Any
+    expires_at: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def dumps(self) -> bytes:
+        return json.dumps({
+            "value": self.value,
+            "expires_at": self.expires_at,
+            "metadata": self.metadata,
+        }).encode("utf-8")
+
+    @classmethod
+    def loads(cls, data: bytes) -> "SharedEntry":
+        record = json.loads(data)
+        return cls(
+            value=record["value"],
+            expires_at=record["expires_at"],
+            metadata=record.get("metadata") or {},
+        )
+
+
+class CacheBackend(abc.ABC):
+    """
+    Key/value store for `SharedEntry` records with a per-key TTL.
+
+    Backends are a best-effort second level behind the in-process caches:
+    they log and swallow their own errors, and a failed read is a miss.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[SharedEntry]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def set(self, key: str, entry: SharedEntry, ttl: float) -> None:
+        """
+        Store `entry` under `key`; the backend may drop it after `ttl` seconds.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process backend; shares entries between clients in the same process only.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[SharedEntry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        data, drop_at = item
+        if drop_at <= time.time():
+            del self._entries[key]
+            return None
+        return SharedEntry.loads(data)
+
+    async def set(self, key: str, entry: SharedEntry, ttl: float) -> None:
+        self._entries[key] = (entry.dumps(), time.time() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Backend stored in a SQLite database in WAL mode, shared by every server
+    process on the host that points at the same file.
+
+    Queries run in a worker thread; expired rows are purged periodically on write.
+    """
+
+    PURGE_EVERY = 256
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, drop_at REAL NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value FROM cache WHERE key = ? AND drop_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, data: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, drop_at) VALUES (?, ?, ?)",
+                    (key, data, now + ttl),
+                )
+                self._writes += 1
+                if self._writes % self.PURGE_EVERY == 0:
+                    conn.execute("DELETE FROM cache WHERE drop_at <= ?", (now,))
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def _close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def get(self, key: str) -> Optional[SharedEntry]:
+        try:
+            data = await asyncio.to_thread(self._get, key)
+            return SharedEntry.loads(data) if data is not None else None
+        except (sqlite3.Error, OSError, ValueError, KeyError) as e:
+            logger.warning("Shared cache read failed for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, entry: SharedEntry, ttl: float) -> None:
+        try:
+            await asyncio.to_thread(self._set, key, entry.dumps(), ttl)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Shared cache write failed for %s: %s", key, e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await asyncio.to_thread(self._delete, key)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Shared cache delete failed for %s: %s", key, e)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self._close)
+
+
+class RedisError(Exception):
+    pass
+
+
+# Failures of a Redis round trip; the backend treats them as cache misses
+_REDIS_ERRORS = (RedisError, OSError, asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend speaking the Redis protocol (RESP) over a single connection.
+
+    Only GET, SET with PX, DEL, AUTH and SELECT are used, so Redis, Valkey,
+    KeyDB or any small local stand-in implementing them will do.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 6379,
+        db: int = 0,
+        password: Optional[str] = None,
+        username: Optional[str] = None,
+        prefix: str = "gravatar:",
+        timeout: float = 2.0,
+    ):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.username = username
+        self.prefix = prefix
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # RESP replies come back in order; one command in flight at a time
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(*args: bytes | str | int) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif isinstance(arg, int):
+                arg = str(arg).encode("ascii")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by the cache server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(payload.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(payload)
+            if count < 0:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected reply type {kind!r}")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            if self.password:
+                auth = (self.username, self.password) if self.username else (self.password,)
+                await self._send("AUTH", *auth)
+            if self.db:
+                await self._send("SELECT", self.db)
+        except RedisError:
+            await self._disconnect()
+            raise
+
+    async def _send(self, *args: bytes | str | int) -> Any:
+        self._writer.write(self._encode(*args))
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def _roundtrip(self, *args: bytes | str | int) -> Any:
+        if self._writer is None:
+            await self._connect()
+        return await self._send(*args)
+
+    async def _execute(self, *args: bytes | str | int) -> Any:
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._roundtrip(*args), self.timeout)
+            except BaseException:
+                # A reply may still be unread (e.g. the caller was cancelled),
+                # and the next command would read it as its own; drop the
+                # connection instead, and the next command reconnects
+                await self._disconnect()
+                raise
+
+    async def _disconnect(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def get(self, key: str) -> Optional[SharedEntry]:
+        try:
+            data = await self._execute("GET", self.prefix + key)
+            return SharedEntry.loads(data) if data is not None else None
+        except (*_REDIS_ERRORS, ValueError, KeyError) as e:
+            logger.warning("Shared cache read failed for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, entry: SharedEntry, ttl: float) -> None:
+        try:
+            await self._execute(
+                "SET", self.prefix + key, entry.dumps(), "PX", max(int(ttl * 1000), 1))
+        except _REDIS_ERRORS as e:
+            logger.warning("Shared cache write failed for %s: %s", key, e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._execute("DEL", self.prefix + key)
+        except _REDIS_ERRORS as e:
+            logger.warning("Shared cache delete failed for %s: %s", key, e)
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+
+def create_backend(url: str) -> Optional[CacheBackend]:
+    """
+    Build a backend from a URL: "memory://", "sqlite:///path/to/cache.db" or
+    "redis://[[user]:password@]host[:port][/db]". An empty URL disables it.
+    """
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == "memory":
+        return MemoryCacheBackend()
+    if parsed.scheme == "sqlite":
+        path = os.path.expanduser(unquote(parsed.netloc + parsed.path))
+        if not path:
+            raise ValueError("sqlite cache backend URL needs a path, e.g. sqlite:///tmp/gravatar.db")
+        return SQLiteCacheBackend(path)
+    if parsed.scheme == "redis":
+        db = parsed.path.lstrip("/")
+        return RedisCacheBackend(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+            username=unquote(parsed.username) if parsed.username else None,
+        )
+    raise ValueError(f"Unsupported cache backend URL scheme: {parsed.scheme!r}")
@@ -0,0 +1,125 @@
+import asyncio
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from .metrics import wrap_handlers
+
+# Monotonic time by which the current tool call must finish, if any
+_deadline: ContextVar[Optional[float]] = ContextVar("gravatar_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request runs past the deadline of the tool call it serves.
+    """
+
+
+def remaining() -> Optional[float]:
+    """
+    Return the seconds left until the current deadline, or None without one.
+
+    Raises `DeadlineExceeded` once the deadline has passed, so no new work starts.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Deadline exceeded")
+    return left
+
+
+def timeout_within(timeout: float) -> float:
+    """
+    Cap a per-request timeout to the time left until the current deadline.
+    """
+    left = remaining()
+    return timeout if left is None else min(timeout, left)
+
+
+@contextmanager
+def deadline(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Set a deadline `timeout` seconds from now for the block, unless an
+    enclosing one is sooner. Tasks started inside the block inherit it.
+    """
+    current = _deadline.get()
+    if timeout is not None:
+        new = time.monotonic() + timeout
+        current = new if current is None else min(current, new)
+    token = _deadline.set(current)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def without_deadline() -> Iterator[None]:
+    """
+    Clear the deadline for the block, for work that outlives the current call.
+    """
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _requested_timeout(mcp) -> Optional[float]:
+    """
+    Read a per-call override from the request's `_meta`, e.g.
+    `{"_meta": {"timeout": 5}}`.
+    """
+    try:
+        meta = mcp.get_context().request_context.meta
+    except (ValueError, LookupError):
+        return None
+    value = getattr(meta, "timeout", None) if meta is not None else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _with_deadline(fn: Callable, mcp, default_timeout: Optional[float], name: str) -> Callable:
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        timeout = _requested_timeout(mcp)
+        if timeout is None:
+            timeout = default_timeout
+        elif timeout <= 0:
+            # As with GRAVATAR_TOOL_TIMEOUT, 0 means no deadline
+            timeout = None
+        with deadline(timeout):
+            left = remaining()
+            try:
+                # Cancels the call, and with it its upstream requests, at the deadline
+                return await asyncio.wait_for(fn(*args, **kwargs), left)
+            except asyncio.TimeoutError as e:
+                raise DeadlineExceeded(f"{name} did not finish within {timeout:g}s") from e
+
+    wrapper.__deadline__ = True
+    return wrapper
+
+
+def apply_deadlines(mcp, default_timeout: Optional[float]) -> None:
+    """
+    Give every async tool and resource registered on `mcp` a deadline.
+
+    Clients can set one per call with `timeout` (in seconds) in the request's
+    `_meta`, where 0 or less means none; otherwise `default_timeout` applies,
+    and None means no deadline.
+    Requests to Gravatar made for the call get their timeouts capped to the
+    time left, and the call is cancelled when it runs out.
+    """
+    def wrap(fn: Callable, kind: str, name: str) -> Callable:
+        if getattr(fn, "__deadline__", False) or not inspect.iscoroutinefunction(fn):
+            return fn
+        return _with_deadline(fn, mcp, default_timeout, name)
+
+    wrap_handlers(mcp, wrap)
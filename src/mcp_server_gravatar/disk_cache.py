@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DiskCacheEntry:
+    data: bytes
+    expires_at: float
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    def staleness(self) -> float:
+        """
+        Return how many seconds ago the entry expired (negative while fresh).
+        """
+        return time.time() - self.expires_at
+
+
+class DiskCache:
+    """
+    Content-addressed on-disk cache for avatar images.
+
+    Each entry is stored as two files named after the SHA256 of its key: the raw
+    bytes and a small JSON metadata sidecar. Writes are atomic (temp file plus
+    `os.replace`), reads are served through `mmap`, and the least recently used
+    entries are evicted once the total size exceeds `max_bytes`. Several
+    processes can share a directory: the total is measured on disk at each
+    write rather than tracked in memory. A `max_bytes` of 0 disables the cache.
+
+    Methods do blocking file I/O; call them via `asyncio.to_thread` from async code.
+    """
+
+    DATA_SUFFIX = ".bin"
+    META_SUFFIX = ".json"
+    TEMP_PREFIX = ".tmp-"
+    # Temporary files older than this were left behind by an interrupted download
+    TEMP_MAX_AGE = 3600.0
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int, ttl: float):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """
+        Return the content address for a URL, including its query parameters.
+        """
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, url: str) -> Optional[DiskCacheEntry]:
+        """
+        Return the entry cached for `url`, fresh or not, or None if absent.
+        """
+        if self.max_bytes <= 0:
+            return None
+        path = self._path(self.key_for(url))
+        data_path = path.with_suffix(self.DATA_SUFFIX)
+        meta_path = path.with_suffix(self.META_SUFFIX)
+        try:
+            metadata = json.loads(meta_path.read_bytes())
+            data = self._read_mapped(data_path)
+            # Touch the data file so eviction sees it as recently used
+            os.utime(data_path)
+        except (OSError, ValueError):
+            return None
+        return DiskCacheEntry(
+            data=data,
+            expires_at=metadata.pop("expires_at", 0.0),
+            metadata=metadata,
+        )
+
+    def set(self, url: str, data: bytes, ttl: Optional[float] = None, **metadata: Any) -> None:
+        """
+        Atomically store `data` for `url` and evict old entries if over budget.
+        """
+        if self.max_bytes <= 0 or len(data) > self.max_bytes:
+            return
+        ttl = self.ttl if ttl is None else ttl
+        path = self._path(self.key_for(url))
+        data_path = path.with_suffix(self.DATA_SUFFIX)
+        meta_path = path.with_suffix(self.META_SUFFIX)
+        metadata = {**metadata, "url": url, "expires_at": time.time() + ttl}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._write_atomic(data_path, data)
+                self._write_atomic(meta_path, json.dumps(metadata).encode("utf-8"))
+                self._evict()
+        except OSError as e:
+            logger.warning("Failed to write avatar cache entry for %s: %s", url, e)
+
+    def create_temp(self, url: str) -> tuple[BinaryIO, str]:
+        """
+        Open a temporary file next to the entry for `url`, to stream a download into.
+
+        Pass the path to `commit` once the file is complete, or `discard` on failure.
+        """
+        path = self._path(self.key_for(url))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=self.TEMP_PREFIX)
+        return os.fdopen(fd, "wb"), tmp_path
+
+    def commit(self, url: str, tmp_path: str, ttl: Optional[float] = None, **metadata: Any) -> bytes:
+        """
+        Move a completed temporary file into place as the entry for `url`.
+
+        Returns the stored bytes. Files larger than `max_bytes` are returned
+        but not kept.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        path = self._path(self.key_for(url))
+        data_path = path.with_suffix(self.DATA_SUFFIX)
+        meta_path = path.with_suffix(self.META_SUFFIX)
+        metadata = {**metadata, "url": url, "expires_at": time.time() + ttl}
+        try:
+            data = self._read_mapped(Path(tmp_path))
+        except BaseException:
+            self.discard(tmp_path)
+            raise
+        try:
+            if self.max_bytes <= 0 or len(data) > self.max_bytes:
+                return data
+            with self._lock:
+                os.replace(tmp_path, data_path)
+                self._write_atomic(meta_path, json.dumps(metadata).encode("utf-8"))
+                self._evict()
+        except OSError as e:
+            # The data was read before the move, so the download is still served
+            logger.warning("Failed to write avatar cache entry for %s: %s", url, e)
+        finally:
+            self.discard(tmp_path)
+        return data
+
+    def discard(self, tmp_path: str) -> None:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    def touch(self, url: str, ttl: Optional[float] = None, **metadata: Any) -> None:
+        """
+        Extend the expiry of an existing entry, e.g. after a 304 revalidation.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        meta_path = self._path(self.key_for(url)).with_suffix(self.META_SUFFIX)
+        try:
+            current = json.loads(meta_path.read_bytes())
+            current.update(metadata)
+            current["expires_at"] = time.time() + ttl
+            self._write_atomic(meta_path, json.dumps(current).encode("utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to refresh avatar cache entry for %s: %s", url, e)
+
+    @staticmethod
+    def _read_mapped(path: Path) -> bytes:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            # A single copy straight from the page cache, without an intermediate buffer
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[:]
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=self.TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _scan(self) -> list[tuple[str, os.stat_result]]:
+        """
+        List the data files with their stats, removing abandoned temporary files.
+        """
+        files = []
+        if not self.directory.is_dir():
+            return files
+        abandoned = time.time() - self.TEMP_MAX_AGE
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Evicted or committed by another process meanwhile
+                    continue
+                if entry.name.endswith(self.DATA_SUFFIX):
+                    files.append((entry.path, stat))
+                elif entry.name.startswith(self.TEMP_PREFIX) and stat.st_mtime < abandoned:
+                    self.discard(entry.path)
+        return files
+
+    def _evict(self) -> None:
+        """
+        Remove least recently used entries until the cache fits in `max_bytes`.
+
+        Must be called with `self._lock` held.
+        """
+        files = self._scan()
+        total = sum(stat.st_size for _, stat in files)
+        if total <= self.max_bytes:
+            return
+        for path, stat in sorted(files, key=lambda f: f[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            data_path = Path(path)
+            for victim in (data_path, data_path.with_suffix(self.META_SUFFIX)):
+                try:
+                    victim.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= stat.st_size
@@ -0,0 +1,188 @@
+import asyncio
+import ipaddress
+import itertools
+import socket
+import time
+from typing import Any, Callable, Iterable, Optional
+
+import httpcore
+
+from .singleflight import SingleFlight
+
+
+class DNSCache:
+    """
+    Caches resolved addresses per (host, port) for `ttl` seconds.
+
+    Lookups go through the event loop's `getaddrinfo`, so they do not block
+    it; concurrent lookups of the same host share one query. The system
+    resolver does not report record TTLs, so one fixed TTL applies. Failed
+    lookups are not cached.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[tuple[str, int], tuple[list[str], float]] = {}
+        self._inflight = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """
+        Return the addresses for `host`, in the order the resolver gave them.
+        """
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > self._clock():
+            self.hits += 1
+            return entry[0]
+        self.misses += 1
+        return await self._inflight.do(key, lambda: self._lookup(host, port))
+
+    async def _lookup(self, host: str, port: int) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM)
+        addresses = []
+        for _family, _type, _proto, _canonname, sockaddr in infos:
+            if sockaddr[0] not in addresses:
+                addresses.append(sockaddr[0])
+        self._entries[(host, port)] = (addresses, self._clock() + self.ttl)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        self._entries.pop((host, port), None)
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# How long a connection attempt gets before the next address is tried
+# alongside it, as recommended by RFC 8305 ("Happy Eyeballs")
+HAPPY_EYEBALLS_DELAY = 0.25
+
+
+def _interleave_families(addresses: list[str]) -> list[str]:
+    """
+    Alternate IPv6 and IPv4 addresses, starting with the family of the first.
+    """
+    families: dict[bool, list[str]] = {}
+    for address in addresses:
+        families.setdefault(":" in address, []).append(address)
+    return [
+        address
+        for group in itertools.zip_longest(*families.values())
+        for address in group
+        if address is not None
+    ]
+
+
+async def _discard(tasks: Iterable[asyncio.Task]) -> None:
+    """
+    Cancel connection attempts, closing any that connected anyway.
+    """
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, httpcore.AsyncNetworkStream):
+            await result.aclose()
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCachingBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that resolves hosts through a `DNSCache` and
+    then connects to the first address that answers.
+
+    Attempts alternate between IPv6 and IPv4 addresses and start
+    `happy_eyeballs_delay` seconds apart, or as soon as the previous one
+    fails, so an unreachable address does not hold up the rest for the full
+    connect timeout. The first connection wins and the other attempts are
+    cancelled.
+
+    TLS is started later by httpcore with the original hostname for SNI and
+    certificate checks, so connecting by address does not affect them. One
+    instance can be shared by several connection pools.
+    """
+
+    def __init__(
+        self,
+        cache: DNSCache,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None,
+        happy_eyeballs_delay: float = HAPPY_EYEBALLS_DELAY,
+    ):
+        self.cache = cache
+        self._backend = backend or httpcore.AnyIOBackend()
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        if _is_ip_address(host):
+            return await self._backend.connect_tcp(
+                host, port, timeout=timeout, local_address=local_address,
+                socket_options=socket_options)
+        try:
+            addresses = await asyncio.wait_for(self.cache.resolve(host, port), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}") from e
+        error: Optional[Exception] = None
+        pending: set[asyncio.Task] = set()
+        remaining = iter(_interleave_families(addresses))
+        try:
+            while True:
+                address = next(remaining, None)
+                if address is not None:
+                    pending.add(asyncio.ensure_future(self._backend.connect_tcp(
+                        address, port, timeout=timeout, local_address=local_address,
+                        socket_options=socket_options)))
+                elif not pending:
+                    break
+                # Start the next address after the delay or a failure, whichever is first
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=self.happy_eyeballs_delay if address is not None else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                streams = []
+                for task in done:
+                    try:
+                        streams.append(task.result())
+                    except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                        error = e
+                if streams:
+                    for stream in streams[1:]:
+                        await stream.aclose()
+                    return streams[0]
+        finally:
+            if pending:
+                await _discard(pending)
+        # Every address failed; the host may have moved, so look it up again next time
+        self.cache.invalidate(host, port)
+        raise error or httpcore.ConnectError(f"No addresses found for {host}")
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: Optional[float] = None,
+        socket_options: Optional[Iterable[Any]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
@@ -1,32 +1,90 @@
+from contextlib import asynccontextmanager
 from fastmcp import FastMCP
 from .tools.avatar_tools import AvatarTools
+from .tools.diagnostics_tools import DiagnosticsTools
 from .tools.profile_tools import ProfileTools
-from . import gravatar_client
+from . import gravatar_client, settings
+from .deadline import apply_deadlines
+from .metrics import instrument_server
 
-# Initialize FastMCP server
-mcp = FastMCP("gravatar")
 client = gravatar_client.client
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    # Share one pooled HTTP client across all requests and sessions
+    await client.open()
+    if settings.PREWARM_CONNECTIONS:
+        # Connect to Gravatar while the MCP client is still initializing
+        client.start_prewarm()
+    try:
+        yield
+    finally:
+        await client.close()
+
+
+# Initialize FastMCP server
+mcp = FastMCP("gravatar", lifespan=lifespan)
 profile_tools = ProfileTools(client=client)
 avatar_tools = AvatarTools(client=client)
+diagnostics_tools = DiagnosticsTools(client=client)
 
 
 def register_tools(mcp: FastMCP):
     profile_tools.register_tools(mcp)
     avatar_tools.register_tools(mcp)
+    diagnostics_tools.register_tools(mcp)
 
 
 def register_resources(mcp: FastMCP):
     profile_tools.register_resources(mcp)
     avatar_tools.register_resources(mcp)
+    diagnostics_tools.register_resources(mcp)
 
 
 def register_prompts(mcp: FastMCP):
     profile_tools.register_prompts(mcp)
 
 
-def serve():
-    # Run the MCP server over stdio
+def register_deadlines(mcp: FastMCP):
+    """
+    Bound every registered tool and resource by `settings.TOOL_TIMEOUT`,
+    unless the request sets its own `timeout` in `_meta`.
+    """
+    apply_deadlines(mcp, settings.TOOL_TIMEOUT if settings.TOOL_TIMEOUT > 0 else None)
+
+
+def register_metrics(mcp: FastMCP):
+    """
+    Time every registered tool and resource, and expose the metrics at
+    `/metrics` in the Prometheus text format on network transports.
+    """
+    instrument_server(mcp, client.metrics)
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics_endpoint(request):
+        from starlette.responses import PlainTextResponse
+
+        return PlainTextResponse(
+            client.metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def serve(transport: str = "stdio", host: str = "127.0.0.1", port: int = 8000):
+    """
+    Run the MCP server.
+
+    With "sse" one long-running process serves many clients, which
+    share the caches, rate limit budget and connection pools.
+    """
     register_tools(mcp)
     register_resources(mcp)
     register_prompts(mcp)
-    mcp.run(transport="stdio")
+    # Before metrics, so calls that run out of time count as errors
+    register_deadlines(mcp)
+    register_metrics(mcp)
+    if transport == "stdio":
+        mcp.run(transport="stdio")
+    elif transport == "sse":
+        mcp.run(transport="sse", host=host, port=port)
+    else:
+        raise ValueError(f"Unknown transport: {transport}")
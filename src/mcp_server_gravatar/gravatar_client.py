@@ -1,51 +1,746 @@
+from __future__ import annotations
+import asyncio
+import functools
 import os
 import json
 import hashlib
-from typing import Optional, List
-from openapi_client import Configuration, ApiClient
-from openapi_client.api.profiles_api import ProfilesApi
-from openapi_client.api.avatars_api import AvatarsApi
-from openapi_client.models import Avatar, Profile
+import importlib.util
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Iterable, Optional, List
+import httpx
+from openapi_client.api_response import ApiResponse
+from openapi_client.exceptions import ApiException, NotFoundException
+from . import images, settings
+from .cache import MISSING, CacheEntry, StalePolicy, TTLCache
+from .cache_backends import SharedEntry, create_backend
+from .disk_cache import DiskCache, DiskCacheEntry
+from .deadline import timeout_within, without_deadline
+from .dns_cache import DNSCache, DNSCachingBackend
+from .metrics import Metrics
+from .rate_limit import RateLimiter
+from .retry import CircuitOpenError, Retrier, RetryBudget, RetryPolicy
+from .singleflight import SingleFlight
+from .tls import ssl_context
+
+if TYPE_CHECKING:
+    from openapi_client import AvatarsApi, Configuration, ProfilesApi
+    from openapi_client.api_client import RequestSerialized
+    from openapi_client.models import Avatar, Profile
+    from .async_api_client import AsyncApiClient
+
+logger = logging.getLogger(__name__)
 
 GRAVATAR_API_TOKEN = os.environ.get("GRAVATAR_API_TOKEN")
 USER_AGENT = "gravatar-mcp/1.0"
 
+# Response type maps, mirroring the ones in the generated API methods.
+GET_AVATARS_RESPONSE_TYPES = {
+    '200': "List[Avatar]",
+    '401': "Error",
+    '403': "Error",
+}
+# Profiles are kept as the raw JSON object so callers can project fields
+# without building the full model.
+GET_PROFILE_BY_ID_RESPONSE_TYPES = {
+    '200': "object",
+    '404': None,
+    '429': "Error",
+    '500': None,
+}
+
+# Endpoint labels for upstream request metrics
+PROFILE_ENDPOINT = "/profiles/{profileIdentifier}"
+AVATARS_ENDPOINT = "/me/avatars"
+AVATAR_IMAGE_ENDPOINT = "avatar_image"
+
+# Cached in place of a profile that the API reported as not found
+_PROFILE_NOT_FOUND = object()
+
+
+def _validators(headers) -> dict[str, str]:
+    """
+    Extract cache validators (ETag / Last-Modified) from response headers.
+    """
+    validators = {}
+    if headers:
+        if headers.get("etag"):
+            validators["etag"] = headers.get("etag")
+        if headers.get("last-modified"):
+            validators["last_modified"] = headers.get("last-modified")
+    return validators
+
+
+def _conditional_headers(validators: dict) -> dict[str, str]:
+    """
+    Build If-None-Match / If-Modified-Since headers from stored validators.
+    """
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+@functools.lru_cache(maxsize=settings.EMAIL_HASH_CACHE_SIZE)
+def _hash_email(email: str) -> str:
+    return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """
+    Whether an error is worth hiding behind a stale cache entry: server
+    errors, rate limiting and network failures, but not e.g. a 404.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return True
+    if isinstance(exc, ApiException):
+        return exc.status in (0, 429) or (exc.status or 0) >= 500
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def _http2_enabled() -> bool:
+    if not settings.HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "GRAVATAR_HTTP2 is set but the 'h2' package is not installed; "
+            "falling back to HTTP/1.1")
+        return False
+    return True
+
+
+def _error_summary(exc: BaseException) -> str:
+    if isinstance(exc, ApiException):
+        return f"{exc.status} {exc.reason}"
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"{exc.response.status_code} {exc.response.reason_phrase}"
+    return str(exc) or type(exc).__name__
+
 
 class GravatarClient:
     """
     Encapsulates configuration, authentication, and API clients for Gravatar.
+
+    Requests go through an asyncio-native transport, so concurrent tool calls
+    overlap their network waits instead of blocking the event loop. The
+    generated API classes are only used to serialize requests.
     """
 
     def __init__(self):
-        # Configure API client
+        # Identifies the credentials in single-flight keys without holding the token
+        self._auth_identity = (
+            hashlib.sha256(GRAVATAR_API_TOKEN.encode("utf-8")).hexdigest()
+            if GRAVATAR_API_TOKEN else None
+        )
+
+        self._http: Optional[httpx.AsyncClient] = None
+        self.http2 = _http2_enabled()
+        # Number of open() calls not yet matched by close()
+        self._users = 0
+        self._prewarm: Optional[asyncio.Task] = None
+        # Resolved addresses shared by the API and image connection pools
+        self.dns_cache = DNSCache(ttl=settings.DNS_CACHE_TTL) if settings.DNS_CACHE_TTL > 0 else None
+        self._network_backend = (
+            DNSCachingBackend(self.dns_cache) if self.dns_cache is not None else None)
+
+        self.profile_cache = TTLCache(
+            maxsize=settings.PROFILE_CACHE_SIZE,
+            ttl=settings.PROFILE_CACHE_TTL,
+        )
+        self.avatars_cache = TTLCache(maxsize=16, ttl=settings.AVATARS_CACHE_TTL)
+        # How long past expiry each kind of entry may be served
+        self.profile_policy = StalePolicy(
+            stale_while_revalidate=settings.PROFILE_STALE_WHILE_REVALIDATE,
+            stale_if_error=settings.PROFILE_STALE_IF_ERROR,
+        )
+        self.avatar_policy = StalePolicy(
+            stale_while_revalidate=settings.AVATAR_STALE_WHILE_REVALIDATE,
+            stale_if_error=settings.AVATAR_STALE_IF_ERROR,
+        )
+        self.avatars_policy = StalePolicy(
+            stale_while_revalidate=settings.AVATARS_STALE_WHILE_REVALIDATE,
+            stale_if_error=settings.AVATARS_STALE_IF_ERROR,
+        )
+        # Background refreshes of stale entries, referenced until they finish
+        self._refreshes: set[asyncio.Task] = set()
+        # Optional second level shared with other server processes on the host
+        self.shared_cache = create_backend(settings.CACHE_BACKEND)
+        self.image_cache = DiskCache(
+            directory=settings.AVATAR_CACHE_DIR,
+            max_bytes=settings.AVATAR_CACHE_MAX_BYTES,
+            ttl=settings.AVATAR_CACHE_TTL,
+        )
+        self.image_processor = images.ImageProcessor(max_workers=settings.IMAGE_WORKERS)
+        # Concurrent identical requests share one upstream call
+        self._inflight = SingleFlight()
+        self.rate_limiter = RateLimiter(
+            reserve=settings.RATE_LIMIT_RESERVE,
+            max_wait=settings.RATE_LIMIT_MAX_WAIT,
+        )
+        self.retrier = Retrier(
+            RetryPolicy(
+                max_attempts=settings.RETRY_MAX_ATTEMPTS,
+                base_delay=settings.RETRY_BASE_DELAY,
+                max_delay=settings.RETRY_MAX_DELAY,
+            ),
+            RetryBudget(ratio=settings.RETRY_BUDGET_RATIO, max_tokens=settings.RETRY_BUDGET_MAX),
+            failure_threshold=settings.CIRCUIT_BREAKER_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_BREAKER_RESET_TIMEOUT,
+        )
+        self.metrics = Metrics()
+
+    # The generated client and API classes take a while to import and set up,
+    # so they are built on first use rather than when the server starts.
+    @functools.cached_property
+    def _configuration(self) -> Configuration:
+        from openapi_client.configuration import Configuration
+
         config = Configuration()
         config.access_token = GRAVATAR_API_TOKEN
+        if settings.SSL_CA_CERT:
+            config.ssl_ca_cert = settings.SSL_CA_CERT
+        return config
+
+    @functools.cached_property
+    def _api_client(self) -> AsyncApiClient:
+        from .async_api_client import AsyncApiClient
+
+        api_client = AsyncApiClient(
+            configuration=self._configuration,
+            # Multiplex concurrent profile and avatar list requests over one connection
+            http2=self.http2,
+            network_backend=self._network_backend,
+        )
+        api_client.user_agent = USER_AGENT
+        return api_client
+
+    @functools.cached_property
+    def profiles_api(self) -> ProfilesApi:
+        from openapi_client.api.profiles_api import ProfilesApi
+
+        return ProfilesApi(self._api_client)
+
+    @functools.cached_property
+    def avatars_api(self) -> AvatarsApi:
+        from openapi_client.api.avatars_api import AvatarsApi
+
+        return AvatarsApi(self._api_client)
+
+    async def open(self):
+        """
+        Create the long-lived HTTP client used for avatar image downloads.
+
+        Calls nest: each `open()` must be paired with a `close()`, and the
+        shared connections are only released by the last one. Network
+        transports enter the server lifespan once per client session.
+        """
+        self._users += 1
+        if self._http is None:
+            # Load the CA certificates off the event loop; every client shares them
+            await asyncio.to_thread(ssl_context, self._configuration)
+        self._ensure_open()
+
+    def _ensure_open(self):
+        if self._http is not None:
+            return
+        transport = httpx.AsyncHTTPTransport(
+            verify=ssl_context(self._configuration),
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+        if self._network_backend is not None:
+            # httpx does not expose httpcore's network_backend option
+            transport._pool._network_backend = self._network_backend
+        self._http = httpx.AsyncClient(
+            transport=transport,
+            timeout=settings.HTTP_TIMEOUT,
+            headers={"User-Agent": USER_AGENT},
+        )
+
+    async def close(self):
+        """
+        Release pooled connections held by the API and image clients.
+        """
+        self._users = max(self._users - 1, 0)
+        if self._users:
+            return
+        if self._prewarm is not None:
+            self._prewarm.cancel()
+            self._prewarm = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self.image_processor.close()
+        for task in list(self._refreshes):
+            task.cancel()
+        if "_api_client" in self.__dict__:
+            await self._api_client.close()
+        if self.shared_cache is not None:
+            await self.shared_cache.close()
+
+    def start_prewarm(self) -> None:
+        """
+        Run `prewarm()` in the background, once per open client.
+        """
+        if self._prewarm is None:
+            self._prewarm = asyncio.ensure_future(self.prewarm())
+
+    async def prewarm(self) -> None:
+        """
+        Get the first request's setup work out of the way.
+
+        Imports the generated API client in a worker thread, and sends a HEAD
+        request to the API and avatar hosts so that DNS, TCP and TLS are done
+        and a keep-alive connection is waiting in each pool. Failures are
+        logged and otherwise ignored.
+        """
+        start = time.perf_counter()
+        # Importing the generated client and its models holds the GIL for a
+        # while, but keeps the import lock off the event loop
+        for module in ("mcp_server_gravatar.async_api_client",
+                       "openapi_client.api.profiles_api",
+                       "openapi_client.api.avatars_api"):
+            await asyncio.to_thread(importlib.import_module, module)
+        self._ensure_open()
+        targets = [
+            (self._api_client.rest_client.pool_manager, self._configuration.host),
+            (self._http, images.AVATAR_BASE_URL),
+        ]
+        results = await asyncio.gather(
+            *(client.head(url, timeout=settings.HTTP_TIMEOUT) for client, url in targets),
+            return_exceptions=True,
+        )
+        for (_, url), result in zip(targets, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not pre-warm a connection to %s: %s", url, _error_summary(result))
+        logger.info("Pre-warmed connections in %.0f ms", (time.perf_counter() - start) * 1000)
+
+    def _refresh_in_background(self, key: Any, fn) -> None:
+        """
+        Run `fn` through single-flight without waiting for it, to refresh a
+        stale entry that is being served meanwhile.
+        """
+        # The refresh outlives the call that triggered it, so not its deadline
+        with without_deadline():
+            task = asyncio.ensure_future(self._inflight.do(key, fn))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed: %s", task.exception())
 
-        self._api_client = ApiClient(configuration=config)
-        self._api_client.user_agent = USER_AGENT
+    def _record_lookup(self, cache: str, result: str) -> None:
+        self.metrics.inc("gravatar_cache_lookups_total", cache=cache, result=result)
 
-        self.profiles_api = ProfilesApi(self._api_client)
-        self.avatars_api = AvatarsApi(self._api_client)
+    def _record_response(self, endpoint: str, status: int | str, num_bytes: int) -> None:
+        self.metrics.inc("gravatar_upstream_responses_total", endpoint=endpoint, status=status)
+        self.metrics.inc("gravatar_upstream_response_bytes_total", num_bytes, endpoint=endpoint)
+        if status == 429:
+            self.metrics.inc("gravatar_upstream_rate_limited_total", endpoint=endpoint)
 
-    def get_avatars(
+    async def get_image(self, url: str) -> bytes:
+        """
+        Download an avatar image over the shared connection pool.
+
+        Images are persisted in the on-disk cache, keyed by the full URL
+        (including size parameters), and served from it while fresh, or
+        while stale within `avatar_policy`.
+        Concurrent downloads of the same URL are merged into one request.
+        """
+        return await self._inflight.do(("GET", url), lambda: self._load_image(url))
+
+    async def get_image_variant(
+        self,
+        url: str,
+        size: Optional[int] = None,
+        image_format: Optional[str] = None,
+    ) -> tuple[bytes, Optional[str]]:
+        """
+        Download an image, shrunk to at most `size` pixels and converted to `image_format`.
+
+        Returns the bytes and their format. Converted variants are kept in the
+        image cache next to their source. Without Pillow the original image is
+        returned when only a resize was asked for, and a ValueError is raised
+        when a different format was.
+        """
+        image_format = images.normalize_format(image_format)
+        key = f"{url}#size={size or ''}&format={image_format or ''}"
+        return await self._inflight.do(
+            ("VARIANT", key), lambda: self._load_variant(url, key, size, image_format))
+
+    async def _load_variant(
+        self,
+        url: str,
+        key: str,
+        size: Optional[int],
+        image_format: Optional[str],
+    ) -> tuple[bytes, Optional[str]]:
+        data = await self.get_image(url)
+        source_format = images.sniff_format(data)
+        target_format = image_format or source_format
+        if size is None and target_format == source_format:
+            return data, source_format
+        if not images.pillow_available():
+            if target_format != source_format:
+                raise ValueError(
+                    "Converting avatar images requires Pillow; install the 'images' extra")
+            return data, source_format
+        if target_format not in images.FORMATS:
+            # e.g. a GIF default image with only a resize requested
+            target_format = "png"
+
+        entry = await asyncio.to_thread(self.image_cache.get, key)
+        if entry is not None and entry.is_fresh():
+            self._record_lookup("avatar_variant", "hit")
+            return entry.data, target_format
+        self._record_lookup("avatar_variant", "miss")
+        converted = await self.image_processor.transform(data, size, target_format)
+        await asyncio.to_thread(
+            self.image_cache.set, key, converted, content_type=images.FORMATS[target_format])
+        return converted, target_format
+
+    async def _load_image(self, url: str) -> bytes:
+        entry = await asyncio.to_thread(self.image_cache.get, url)
+        if entry is not None and entry.is_fresh():
+            self._record_lookup("avatar_image", "hit")
+            return entry.data
+        if entry is not None and self.avatar_policy.serve_while_revalidating(entry.staleness()):
+            self._record_lookup("avatar_image", "stale")
+            self._refresh_in_background(
+                ("REVALIDATE", url),
+                lambda: self.retrier.call(
+                    "GET", url, lambda: self._fetch_image(url, entry),
+                    timeout=settings.HTTP_TIMEOUT))
+            return entry.data
+        self._record_lookup("avatar_image", "miss")
+        try:
+            return await self.retrier.call(
+                "GET", url, lambda: self._fetch_image(url, entry), timeout=settings.HTTP_TIMEOUT)
+        except Exception as e:
+            if (entry is not None and _is_upstream_failure(e)
+                    and self.avatar_policy.serve_on_error(entry.staleness())):
+                logger.warning("Serving stale avatar %s after error: %s", url, _error_summary(e))
+                return entry.data
+            raise
+
+    async def _fetch_image(self, url: str, entry: Optional[DiskCacheEntry]) -> bytes:
+        if self._http is None:
+            self._ensure_open()
+        headers = _conditional_headers(entry.metadata) if entry is not None else {}
+        with self.metrics.track(
+                "gravatar_upstream_request_duration_seconds",
+                "gravatar_upstream_requests_in_flight",
+                endpoint=AVATAR_IMAGE_ENDPOINT):
+            try:
+                async with self._http.stream(
+                        "GET", url, headers=headers,
+                        timeout=timeout_within(settings.HTTP_TIMEOUT)) as response:
+                    try:
+                        return await self._receive_image(url, entry, response)
+                    finally:
+                        self._record_response(
+                            AVATAR_IMAGE_ENDPOINT, response.status_code,
+                            response.num_bytes_downloaded)
+            except httpx.TransportError:
+                self.metrics.inc(
+                    "gravatar_upstream_responses_total",
+                    endpoint=AVATAR_IMAGE_ENDPOINT, status="error")
+                raise
+
+    async def _receive_image(
+        self,
+        url: str,
+        entry: Optional[DiskCacheEntry],
+        response: httpx.Response,
+    ) -> bytes:
+        if response.status_code == 304 and entry is not None:
+            # Not modified: keep the cached bytes and extend their lifetime
+            await asyncio.to_thread(
+                self.image_cache.touch, url, **_validators(response.headers))
+            return entry.data
+        if response.is_error:
+            await response.aread()
+            response.raise_for_status()
+        metadata = {
+            "content_type": response.headers.get("content-type"),
+            **_validators(response.headers),
+        }
+        if self.image_cache.max_bytes > 0:
+            return await self._stream_to_cache(url, response, metadata)
+        return await response.aread()
+
+    async def _stream_to_cache(self, url: str, response: httpx.Response, metadata: dict) -> bytes:
+        """
+        Write the body to the disk cache as it arrives and read it back once.
+
+        Only network-sized chunks are held in memory during the download, so
+        the returned bytes are the single full copy of the image.
+        """
+        f, tmp_path = await asyncio.to_thread(self.image_cache.create_temp, url)
+        try:
+            async for chunk in response.aiter_bytes():
+                await asyncio.to_thread(f.write, chunk)
+            await asyncio.to_thread(f.close)
+        except BaseException:
+            f.close()
+            await asyncio.to_thread(self.image_cache.discard, tmp_path)
+            raise
+        return await asyncio.to_thread(self.image_cache.commit, url, tmp_path, **metadata)
+
+    async def _call_api(
+        self,
+        params: RequestSerialized,
+        response_types_map: dict,
+        endpoint: str,
+    ) -> ApiResponse:
+        async def send():
+            await self.rate_limiter.acquire()
+            with self.metrics.track(
+                    "gravatar_upstream_request_duration_seconds",
+                    "gravatar_upstream_requests_in_flight",
+                    endpoint=endpoint):
+                try:
+                    response_data = await self._api_client.call_api(
+                        *params, _request_timeout=timeout_within(settings.HTTP_TIMEOUT))
+                    await response_data.read()
+                except Exception:
+                    self.metrics.inc(
+                        "gravatar_upstream_responses_total", endpoint=endpoint, status="error")
+                    raise
+            # Count what came over the wire, before decompression
+            self._record_response(
+                endpoint, response_data.status, response_data.response.num_bytes_downloaded)
+            return response_data
+
+        method, url = params[0], params[1]
+        for attempt in range(settings.RATE_LIMIT_MAX_RETRIES + 1):
+            response_data = await self.retrier.call(
+                method, url, send, status_of=lambda r: r.status, timeout=settings.HTTP_TIMEOUT)
+            if response_data.status != 429:
+                self.rate_limiter.update(response_data.getheaders())
+                break
+            # Rate limited: the next acquire() waits for the reset, with jitter
+            self.rate_limiter.on_rate_limited(response_data.getheaders())
+            logger.warning("Gravatar API rate limit exceeded (attempt %d)", attempt + 1)
+
+        if response_data.status == 304:
+            # Conditional request matched; the caller already holds the data
+            return ApiResponse(
+                status_code=response_data.status,
+                headers=response_data.getheaders(),
+                data=None,
+                raw_data=response_data.data,
+            )
+        return self._api_client.response_deserialize(
+            response_data=response_data,
+            response_types_map=response_types_map,
+        )
+
+    async def get_avatars(
         self,
         selected_email_hash: str = None,
     ) -> List[Avatar]:
-        return self.avatars_api.get_avatars(selected_email_hash=selected_email_hash)
+        """
+        List the authenticated user's avatars, cached for `GRAVATAR_AVATARS_CACHE_TTL`.
+        """
+        cached = self.avatars_cache.get(selected_email_hash)
+        if cached is not MISSING:
+            self._record_lookup("avatars", "hit")
+            return cached
+
+        params = self.avatars_api._get_avatars_serialize(
+            selected_email_hash=selected_email_hash,
+            _request_auth=None,
+            _content_type=None,
+            _headers=None,
+            _host_index=0,
+        )
+        method, url = params[0], params[1]
+        key = (method, url, self._auth_identity)
+        stale = self.avatars_cache.peek(selected_email_hash)
+        load = lambda: self._load_avatars(selected_email_hash, params, stale)
+        if stale is not None and self.avatars_policy.serve_while_revalidating(
+                self.avatars_cache.staleness(stale)):
+            self._record_lookup("avatars", "stale")
+            self._refresh_in_background(key, load)
+            return stale.value
+        self._record_lookup("avatars", "miss")
+        return await self._inflight.do(key, load)
 
-    def get_profile_by_id(
+    async def _load_avatars(
+        self,
+        selected_email_hash: Optional[str],
+        params: RequestSerialized,
+        stale: Optional[CacheEntry],
+    ) -> List[Avatar]:
+        try:
+            response = await self._call_api(params, GET_AVATARS_RESPONSE_TYPES, AVATARS_ENDPOINT)
+        except Exception as e:
+            if (stale is not None and _is_upstream_failure(e)
+                    and self.avatars_policy.serve_on_error(self.avatars_cache.staleness(stale))):
+                logger.warning("Serving stale avatar list after error: %s", _error_summary(e))
+                return stale.value
+            raise
+        self.avatars_cache.set(selected_email_hash, response.data)
+        return response.data
+
+    async def get_profile_by_id(
         self,
         profile_identifier: str,
     ) -> Profile:
-        return self.profiles_api.get_profile_by_id(profile_identifier=profile_identifier)
+        """
+        Fetch a profile and build the full `Profile` model from it.
+        """
+        from openapi_client.models import Profile
+
+        return Profile.from_dict(await self.get_profile_json(profile_identifier))
+
+    async def get_profile_json(
+        self,
+        profile_identifier: str,
+    ) -> dict[str, Any]:
+        """
+        Fetch a profile as its raw JSON object, serving repeated lookups from
+        the in-process profile cache. The returned dict is shared with the
+        cache and must not be mutated.
+
+        Profiles the API reports as missing are cached for a shorter TTL, and
+        raise `NotFoundException` again on a cache hit. Expired profiles are
+        revalidated with a conditional request, and a 304 refreshes the entry;
+        within `profile_policy` a stale profile is returned right away while
+        that happens in the background, or instead of an upstream failure.
+        With `GRAVATAR_CACHE_BACKEND` set, misses consult the shared cache
+        before going upstream, and fetched profiles are written back to it.
+        """
+        cached = self.profile_cache.get(profile_identifier)
+        if cached is MISSING:
+            key = ("GET", f"/profiles/{profile_identifier}", self._auth_identity)
+            load = lambda: self._load_profile(profile_identifier)
+            stale = self.profile_cache.peek(profile_identifier)
+            if stale is not None and self.profile_policy.serve_while_revalidating(
+                    self.profile_cache.staleness(stale)):
+                self._record_lookup("profile", "stale")
+                self._refresh_in_background(key, load)
+                cached = stale.value
+            else:
+                self._record_lookup("profile", "miss")
+                return await self._inflight.do(key, load)
+        else:
+            self._record_lookup("profile", "hit")
+        if cached is _PROFILE_NOT_FOUND:
+            raise NotFoundException(status=404, reason="Not Found")
+        return cached
+
+    async def _load_profile(self, profile_identifier: str) -> dict[str, Any]:
+        stale = self.profile_cache.peek(profile_identifier)
+        if stale is not None and stale.value is _PROFILE_NOT_FOUND:
+            stale = None
+
+        if self.shared_cache is not None:
+            shared = await self.shared_cache.get(self._shared_profile_key(profile_identifier))
+            self._record_lookup(
+                "shared_profile", "hit" if shared is not None and shared.is_fresh() else "miss")
+            if shared is not None and shared.is_fresh():
+                # Another process fetched it recently; adopt its remaining lifetime
+                ttl = shared.expires_at - time.time()
+                if shared.metadata.get("not_found"):
+                    self.profile_cache.set(profile_identifier, _PROFILE_NOT_FOUND, ttl=ttl)
+                    raise NotFoundException(status=404, reason="Not Found")
+                self.profile_cache.set(profile_identifier, shared.value, ttl=ttl, **shared.metadata)
+                return shared.value
+            if stale is None and shared is not None and not shared.metadata.get("not_found"):
+                # Shared records carry wall-clock expiries; the local cache is monotonic
+                stale = CacheEntry(
+                    value=shared.value,
+                    expires_at=time.monotonic() - (time.time() - shared.expires_at),
+                    metadata=shared.metadata,
+                )
+
+        headers = _conditional_headers(stale.metadata) if stale is not None else None
+        try:
+            response = await self._fetch_profile(profile_identifier, headers=headers)
+        except NotFoundException:
+            self.profile_cache.set(
+                profile_identifier, _PROFILE_NOT_FOUND, ttl=settings.PROFILE_CACHE_NEGATIVE_TTL)
+            await self._share_profile(
+                profile_identifier, None, settings.PROFILE_CACHE_NEGATIVE_TTL, not_found=True)
+            raise
+        except Exception as e:
+            if (stale is not None and _is_upstream_failure(e)
+                    and self.profile_policy.serve_on_error(self.profile_cache.staleness(stale))):
+                logger.warning("Serving stale profile %s after error: %s", profile_identifier, _error_summary(e))
+                return stale.value
+            raise
+        if response.status_code == 304 and stale is not None:
+            value = stale.value
+            metadata = {**stale.metadata, **_validators(response.headers)}
+        else:
+            value = response.data
+            metadata = _validators(response.headers)
+        self.profile_cache.set(profile_identifier, value, **metadata)
+        await self._share_profile(profile_identifier, value, settings.PROFILE_CACHE_TTL, **metadata)
+        return value
+
+    def _shared_profile_key(self, profile_identifier: str) -> str:
+        # Authenticated requests can see more of a profile, so keep credentials apart
+        return f"profile:{self._auth_identity or 'anonymous'}:{profile_identifier}"
+
+    async def _share_profile(
+        self, profile_identifier: str, value: Any, ttl: float, **metadata: Any
+    ) -> None:
+        if self.shared_cache is None:
+            return
+        entry = SharedEntry(value=value, expires_at=time.time() + ttl, metadata=metadata)
+        # Keep the record for another TTL past expiry so any process can
+        # revalidate it with a conditional request
+        await self.shared_cache.set(
+            self._shared_profile_key(profile_identifier), entry, ttl + settings.PROFILE_CACHE_TTL)
+
+    async def _fetch_profile(
+        self,
+        profile_identifier: str,
+        headers: Optional[dict[str, str]] = None,
+    ) -> ApiResponse:
+        params = self.profiles_api._get_profile_by_id_serialize(
+            profile_identifier=profile_identifier,
+            _request_auth=None,
+            _content_type=None,
+            _headers=headers,
+            _host_index=0,
+        )
+        return await self._call_api(params, GET_PROFILE_BY_ID_RESPONSE_TYPES, PROFILE_ENDPOINT)
 
     @staticmethod
     def hash_email(email: str) -> str:
         """
         Normalize an email address and return its SHA256 hash.
+
+        Results are memoized, since the tools hash the same addresses repeatedly.
+        """
+        return _hash_email(email)
+
+    @staticmethod
+    def hash_emails(emails: Iterable[str]) -> list[str]:
+        """
+        Normalize and hash many email addresses, returning the hashes in order.
+
+        Bypasses the memo so a large import does not evict the addresses in
+        regular use. hashlib keeps the GIL for inputs this small, so this is a
+        plain loop; run it in a worker thread to keep the event loop free.
         """
-        normalized = email.strip().lower()
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        sha256 = hashlib.sha256
+        return [sha256(email.strip().lower().encode("utf-8")).hexdigest() for email in emails]
 
 
 # Singleton client instance for convenience
@@ -0,0 +1,147 @@
+import asyncio
+import importlib.util
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from urllib.parse import urlencode
+
+# Output formats the avatar tools and resources can convert to
+FORMATS = {
+    "png": "image/png",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+}
+RATINGS = ("g", "pg", "r", "x")
+DEFAULT_IMAGES = ("404", "mp", "identicon", "monsterid", "wavatar", "retro", "robohash", "blank")
+MAX_SIZE = 2048
+AVATAR_BASE_URL = "https://gravatar.com/avatar"
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def sniff_format(data: bytes) -> Optional[str]:
+    """
+    Identify an image format from its leading bytes.
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "gif"
+    return None
+
+
+def normalize_format(image_format: Optional[str]) -> Optional[str]:
+    if image_format is None:
+        return None
+    image_format = image_format.lower()
+    if image_format == "jpg":
+        image_format = "jpeg"
+    if image_format not in FORMATS:
+        raise ValueError(
+            f"Unsupported image format {image_format!r}; expected one of {', '.join(FORMATS)}")
+    return image_format
+
+
+def avatar_url(
+    avatar_identifier: str,
+    size: Optional[int] = None,
+    default: Optional[str] = None,
+    rating: Optional[str] = None,
+) -> str:
+    """
+    Build a Gravatar avatar URL; Gravatar resizes the image server-side for `size`.
+
+    Args:
+        avatar_identifier: SHA256 hash of the email address.
+        size: Edge length in pixels (1-2048).
+        default: Image shown when there is no avatar: one of the Gravatar
+            defaults (e.g. "identicon", "404") or an http(s) URL.
+        rating: Highest rating to allow: "g", "pg", "r" or "x".
+    """
+    if not avatar_identifier:
+        raise ValueError("avatar_identifier must not be empty")
+    params = {}
+    if size is not None:
+        if not 1 <= size <= MAX_SIZE:
+            raise ValueError(f"size must be between 1 and {MAX_SIZE}")
+        params["s"] = size
+    if default is not None:
+        if default not in DEFAULT_IMAGES and not default.startswith(("http://", "https://")):
+            raise ValueError(
+                f"default must be a URL or one of {', '.join(DEFAULT_IMAGES)}")
+        params["d"] = default
+    if rating is not None:
+        rating = rating.lower()
+        if rating not in RATINGS:
+            raise ValueError(f"rating must be one of {', '.join(RATINGS)}")
+        params["r"] = rating
+    url = f"{AVATAR_BASE_URL}/{avatar_identifier}"
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+def transform(data: bytes, size: Optional[int], image_format: str) -> bytes:
+    """
+    Resize (down only, keeping the aspect ratio) and re-encode an image.
+
+    Runs in a worker process; requires Pillow.
+    """
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        if size is not None and max(image.size) > size:
+            image.thumbnail((size, size), Image.LANCZOS)
+        if image_format == "jpeg":
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA", "L", "LA"):
+            # e.g. palette or CMYK images, which PNG and WebP cannot all store
+            has_alpha = (
+                any(band in ("A", "a") for band in image.getbands())
+                or "transparency" in image.info
+            )
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        out = io.BytesIO()
+        image.save(out, format=image_format.upper(), optimize=True)
+        return out.getvalue()
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class ImageProcessor:
+    """
+    Runs image resizing and transcoding in a process pool.
+
+    Decoding and encoding images is CPU-bound and holds the GIL, so it is kept
+    off the event loop and out of the server process. The pool is started on
+    first use. Workers are not forked from the server, whose threads may hold
+    the import or logging locks at that moment; they start from a fork server
+    (or are spawned where there is none).
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    async def transform(self, data: bytes, size: Optional[int], image_format: str) -> bytes:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=_mp_context())
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, transform, data, size, image_format)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
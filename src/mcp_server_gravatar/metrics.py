@@ -0,0 +1,239 @@
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Latency buckets in seconds, from cache hits to slow upstream calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help); series are rendered in this order
+FAMILIES = {
+    "gravatar_mcp_request_duration_seconds": (
+        "histogram", "Time spent handling an MCP tool call or resource read."),
+    "gravatar_mcp_requests_total": (
+        "counter", "MCP tool calls and resource reads, by outcome."),
+    "gravatar_mcp_requests_in_flight": (
+        "gauge", "MCP tool calls and resource reads currently being handled."),
+    "gravatar_upstream_request_duration_seconds": (
+        "histogram", "Time spent on a single request to Gravatar, per attempt."),
+    "gravatar_upstream_responses_total": (
+        "counter", "Responses from Gravatar by status; \"error\" for network failures."),
+    "gravatar_upstream_response_bytes_total": (
+        "counter", "Response body bytes received from Gravatar, as sent on the wire."),
+    "gravatar_upstream_requests_in_flight": (
+        "gauge", "Requests to Gravatar currently waiting for a response."),
+    "gravatar_upstream_rate_limited_total": (
+        "counter", "Requests to Gravatar rejected with 429 Too Many Requests."),
+    "gravatar_cache_lookups_total": (
+        "counter", "Cache lookups by result: hit, stale (served while revalidating) or miss."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [
+        '%s="%s"' % (name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in labels
+    ]
+    if extra:
+        parts.append(extra)
+    return "{%s}" % ",".join(parts) if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram; `counts[i]` holds observations <= `buckets[i]`
+    (non-cumulative), with a final overflow bucket.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile by interpolating within its bucket, as Prometheus'
+        histogram_quantile() does.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    # Beyond the last bucket: all we know is the lower bound
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+class Metrics:
+    """
+    In-process registry of counters, gauges and latency histograms.
+
+    Series are keyed by family name (see `FAMILIES`) and label values, passed
+    as keyword arguments. Updates happen on the event loop, so no locking is
+    needed.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self.started_at = time.time()
+        self._values: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, Histogram]] = {}
+
+    def inc(self, name: str, amount: float = 1, /, **labels: Any) -> None:
+        series = self._values.setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, /, **labels: Any) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = _labels(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    @contextmanager
+    def track(self, histogram: str, in_flight: str, /, **labels: Any) -> Iterator[None]:
+        """
+        Count the block as in flight while it runs and record its duration.
+        """
+        self.inc(in_flight, **labels)
+        start = self._clock()
+        try:
+            yield
+        finally:
+            self.observe(histogram, self._clock() - start, **labels)
+            self.inc(in_flight, -1, **labels)
+
+    def value(self, name: str, /, **labels: Any) -> float:
+        return self._values.get(name, {}).get(_labels(labels), 0)
+
+    def series(self, name: str) -> dict[Labels, float]:
+        return dict(self._values.get(name, {}))
+
+    def histogram(self, name: str, /, **labels: Any) -> Optional[Histogram]:
+        return self._histograms.get(name, {}).get(_labels(labels))
+
+    def histograms(self, name: str) -> dict[Labels, Histogram]:
+        return dict(self._histograms.get(name, {}))
+
+    def render(self) -> str:
+        """
+        Render all series in the Prometheus text exposition format (0.0.4).
+        """
+        lines = []
+        for name, (kind, help_text) in FAMILIES.items():
+            if kind == "histogram":
+                series = self._histograms.get(name)
+            else:
+                series = self._values.get(name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(series.items()):
+                if kind != "histogram":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip((*value.buckets, float("inf")), value.counts):
+                    cumulative += count
+                    le = 'le="%s"' % _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _instrumented(fn: Callable, metrics: Metrics, kind: str, name: str) -> Callable:
+    labels = {"kind": kind, "name": name}
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with metrics.track(
+                    "gravatar_mcp_request_duration_seconds", "gravatar_mcp_requests_in_flight",
+                    **labels):
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException:
+                    metrics.inc("gravatar_mcp_requests_total", outcome="error", **labels)
+                    raise
+            metrics.inc("gravatar_mcp_requests_total", outcome="ok", **labels)
+            return result
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with metrics.track(
+                    "gravatar_mcp_request_duration_seconds", "gravatar_mcp_requests_in_flight",
+                    **labels):
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    metrics.inc("gravatar_mcp_requests_total", outcome="error", **labels)
+                    raise
+            metrics.inc("gravatar_mcp_requests_total", outcome="ok", **labels)
+            return result
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def wrap_handlers(mcp, wrap: Callable[[Callable, str, str], Callable]) -> None:
+    """
+    Replace the function of every tool and resource registered on `mcp` so
+    far with `wrap(fn, kind, name)`.
+
+    FastMCP has no middleware hook, so handlers are wrapped in place; call
+    this once all tools and resources are registered.
+    """
+    handlers = [("tool", tool) for tool in mcp._tool_manager.get_tools().values()]
+    handlers += [("resource", resource) for resource in mcp._resource_manager.get_resources().values()]
+    handlers += [("resource", template) for template in mcp._resource_manager.get_templates().values()]
+    for kind, handler in handlers:
+        fn = getattr(handler, "fn", None)
+        if fn is None:
+            continue
+        # Resources are named by URI (template), since several share a function name
+        name = handler.name if kind == "tool" else str(
+            getattr(handler, "uri_template", None) or handler.uri)
+        handler.fn = wrap(fn, kind, name)
+
+
+def instrument_server(mcp, metrics: Metrics) -> None:
+    """
+    Record latency, outcome and in-flight count for every tool and resource
+    registered on `mcp` so far.
+    """
+    def wrap(fn: Callable, kind: str, name: str) -> Callable:
+        if getattr(fn, "__instrumented__", False):
+            return fn
+        return _instrumented(fn, metrics, kind, name)
+
+    wrap_handlers(mcp, wrap)
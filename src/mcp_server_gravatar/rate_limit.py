@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Mapping, Optional
+
+from openapi_client.exceptions import ApiException
+
+from .deadline import timeout_within
+
+logger = logging.getLogger(__name__)
+
+
+def _header_int(headers: Mapping[str, Any], name: str) -> Optional[int]:
+    value = headers.get(name) if headers else None
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Client-side token bucket driven by Gravatar's X-RateLimit-* response headers.
+
+    Each response refreshes the bucket from `X-RateLimit-Limit`, `-Remaining` and
+    `-Reset` (a Unix timestamp). Requests pass straight through while the budget
+    is healthy, are spaced evenly over the rest of the window once it runs low,
+    and queue until the window resets (plus jitter) when only `reserve` requests
+    remain. Waits longer than `max_wait`, or past the current deadline, fail fast
+    with a 429 `ApiException`.
+    """
+
+    def __init__(
+        self,
+        reserve: int = 1,
+        pace_below: float = 0.1,
+        max_wait: float = 60.0,
+        jitter: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.reserve = reserve
+        self.pace_below = pace_below
+        self.max_wait = max_wait
+        self.jitter = jitter
+        self._clock = clock
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.rate_limited = 0
+        self._last_grant = 0.0
+        # asyncio.Lock wakes waiters in FIFO order, so queued requests keep their turn
+        self._lock = asyncio.Lock()
+
+    def update(self, headers: Mapping[str, Any]) -> None:
+        """
+        Refresh the bucket from the rate limit headers of a response.
+        """
+        limit = _header_int(headers, "X-RateLimit-Limit")
+        remaining = _header_int(headers, "X-RateLimit-Remaining")
+        reset = _header_int(headers, "X-RateLimit-Reset")
+        if limit is not None:
+            self.limit = limit
+        if remaining is not None:
+            self.remaining = remaining
+        if reset is not None:
+            self.reset_at = float(reset)
+
+    def on_rate_limited(self, headers: Mapping[str, Any]) -> None:
+        """
+        Record a 429 response; later requests queue until the window resets.
+        """
+        self.rate_limited += 1
+        self.update(headers)
+        self.remaining = 0
+        if self.reset_at is None or self.reset_at <= self._clock():
+            # No usable reset time: back off for a short, jittered interval
+            self.reset_at = self._clock() + 1.0 + random.uniform(0, self.jitter)
+
+    def _roll_window(self, now: float) -> None:
+        if self.reset_at is not None and now >= self.reset_at:
+            # New window: assume the full budget until a response says otherwise
+            self.remaining = self.limit
+            self.reset_at = None
+
+    def _delay(self, now: float) -> float:
+        self._roll_window(now)
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        if self.remaining <= self.reserve:
+            return self.reset_at - now + random.uniform(0, self.jitter)
+        if self.limit and self.remaining < self.limit * self.pace_below:
+            interval = (self.reset_at - now) / self.remaining
+            return max(0.0, self._last_grant + interval - now)
+        return 0.0
+
+    async def acquire(self) -> None:
+        """
+        Wait until a request may be sent under the current budget.
+        """
+        async with self._lock:
+            delay = self._delay(self._clock())
+            # Never wait past the deadline of the call the request serves
+            max_wait = timeout_within(self.max_wait)
+            if delay > max_wait:
+                raise ApiException(
+                    status=429,
+                    reason=f"Rate limit exceeded; the quota resets in {delay:.0f}s",
+                )
+            if delay > 0:
+                logger.debug("Rate limit budget low; delaying request by %.2fs", delay)
+                await asyncio.sleep(delay)
+                self._roll_window(self._clock())
+            if self.remaining is not None and self.remaining > 0:
+                self.remaining -= 1
+            self._last_grant = self._clock()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+            "rate_limited": self.rate_limited,
+        }
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+from .deadline import DeadlineExceeded, remaining
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while a host's circuit breaker is open.
+    """
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"Circuit breaker open for {host}; retrying in {retry_after:.0f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: before retry n (from 0) the delay is
+    drawn uniformly from [0, min(max_delay, base_delay * 2**n)].
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def delay(self, retry: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** retry))
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of overall traffic, so they cannot multiply
+    the load on a struggling upstream.
+
+    Every request earns `ratio` of a retry, up to `max_tokens`; a retry spends
+    a whole one. The bucket starts full so an idle client can still retry.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "tokens": round(self.tokens, 2),
+            "max_tokens": self.max_tokens,
+            "exhausted": self.exhausted,
+        }
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: opens after `failure_threshold` consecutive failures and
+    fails fast for `reset_timeout` seconds, then lets a single probe through
+    (half-open). A successful probe closes it again; a failed one reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.times_opened = 0
+        self._probing = False
+
+    def before_request(self) -> None:
+        """
+        Raise `CircuitOpenError` if the request should not be sent.
+        """
+        if self.state == self.OPEN:
+            elapsed = self._clock() - self.opened_at
+            if elapsed < self.reset_timeout:
+                raise CircuitOpenError(self.host, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                raise CircuitOpenError(self.host, 0)
+            self._probing = True
+
+    def release(self) -> None:
+        """
+        End a request without an outcome that says anything about the host.
+        """
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit breaker for %s opened after %d failures",
+                               self.host, self.failures)
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+    def stats(self) -> dict[str, Any]:
+        retry_after = None
+        if self.state == self.OPEN:
+            retry_after = round(max(0.0, self.reset_timeout - (self._clock() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "retry_after": retry_after,
+        }
+
+
+def _time_left() -> Optional[float]:
+    try:
+        return remaining()
+    except DeadlineExceeded:
+        return 0.0
+
+
+def is_retryable_error(exc: BaseException) -> bool:
+    """
+    Network failures and 5xx responses raised by httpx are worth retrying.
+    """
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUSES
+    return isinstance(exc, httpx.TransportError)
+
+
+class Retrier:
+    """
+    Runs requests under a retry policy, a shared retry budget and per-host
+    circuit breakers. Used by both the API client and the image downloads.
+
+    Only idempotent methods are retried. A request fails as retryable if it
+    raises a network error (or an httpx 5xx error), or if `status_of` maps its
+    result to a 5xx status.
+
+    `timeout` is the request's own timeout. When the caller's deadline left
+    less than that, a timeout is the caller's, not a sign of a failing host:
+    it neither counts against the host's breaker nor is retried.
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        budget: RetryBudget,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.policy = policy
+        self.budget = budget
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host, failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout, clock=self._clock)
+            self.breakers[host] = breaker
+        return breaker
+
+    async def call(
+        self,
+        method: str,
+        url: str,
+        fn: Callable[[], Awaitable[T]],
+        status_of: Optional[Callable[[T], int]] = None,
+        timeout: Optional[float] = None,
+    ) -> T:
+        breaker = self.breaker(urlparse(url).hostname or "")
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            breaker.before_request()
+            left = _time_left()
+            shortened = timeout is not None and left is not None and left < timeout
+            try:
+                result = await fn()
+            except asyncio.CancelledError:
+                breaker.release()
+                raise
+            except Exception as e:
+                if shortened and isinstance(e, httpx.TimeoutException):
+                    breaker.release()
+                    raise
+                if not is_retryable_error(e):
+                    if isinstance(e, httpx.HTTPStatusError):
+                        # The host answered; a 4xx says nothing about its health
+                        breaker.record_success()
+                    else:
+                        breaker.release()
+                    raise
+                breaker.record_failure()
+                delay = self.policy.delay(attempt)
+                if not self._should_retry(idempotent, attempt, delay):
+                    raise
+                logger.info("Retrying %s %s after error: %s", method, url, e)
+            else:
+                status = status_of(result) if status_of is not None else None
+                if status not in RETRYABLE_STATUSES:
+                    breaker.record_success()
+                    return result
+                breaker.record_failure()
+                delay = self.policy.delay(attempt)
+                if not self._should_retry(idempotent, attempt, delay):
+                    return result
+                logger.info("Retrying %s %s after HTTP %d", method, url, status)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _should_retry(self, idempotent: bool, attempt: int, delay: float) -> bool:
+        if not idempotent or attempt + 1 >= self.policy.max_attempts:
+            return False
+        left = _time_left()
+        if left is not None and delay >= left:
+            # The retry could not finish before the caller gives up anyway
+            logger.info("Not retrying; the deadline is %.2fs away", left)
+            return False
+        if not self.budget.withdraw():
+            logger.warning("Retry budget exhausted; not retrying")
+            return False
+        self.retries += 1
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "budget": self.budget.stats(),
+            "circuit_breakers": {host: b.stats() for host, b in self.breakers.items()},
+        }
@@ -0,0 +1,91 @@
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Shared HTTP client used for avatar image downloads
+HTTP_MAX_CONNECTIONS = _env_int("GRAVATAR_HTTP_MAX_CONNECTIONS", 20)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = _env_int("GRAVATAR_HTTP_MAX_KEEPALIVE_CONNECTIONS", 10)
+HTTP_KEEPALIVE_EXPIRY = _env_float("GRAVATAR_HTTP_KEEPALIVE_EXPIRY", 60.0)
+HTTP_TIMEOUT = _env_float("GRAVATAR_HTTP_TIMEOUT", 10.0)
+HTTP2 = _env_bool("GRAVATAR_HTTP2", False)
+# CA bundle for verifying Gravatar's certificates (default: certifi's, else the system's)
+SSL_CA_CERT = os.environ.get("GRAVATAR_SSL_CA_CERT", "")
+# Seconds resolved addresses of Gravatar hosts are reused; 0 disables the cache
+DNS_CACHE_TTL = _env_float("GRAVATAR_DNS_CACHE_TTL", 300.0)
+# Connect to the API and image hosts in the background when the server starts
+PREWARM_CONNECTIONS = _env_bool("GRAVATAR_PREWARM_CONNECTIONS", True)
+
+# Maximum number of avatar images downloaded in parallel by the batch tools
+AVATAR_FETCH_CONCURRENCY = _env_int("GRAVATAR_AVATAR_FETCH_CONCURRENCY", 8)
+
+# Maximum number of profile lookups run in parallel by the batch tool
+PROFILE_BATCH_CONCURRENCY = _env_int("GRAVATAR_PROFILE_BATCH_CONCURRENCY", 8)
+
+# Memo of email address -> SHA256 hash for repeated lookups of the same address
+EMAIL_HASH_CACHE_SIZE = _env_int("GRAVATAR_EMAIL_HASH_CACHE_SIZE", 4096)
+
+# In-process profile cache
+PROFILE_CACHE_SIZE = _env_int("GRAVATAR_PROFILE_CACHE_SIZE", 1024)
+PROFILE_CACHE_TTL = _env_float("GRAVATAR_PROFILE_CACHE_TTL", 300.0)
+PROFILE_CACHE_NEGATIVE_TTL = _env_float("GRAVATAR_PROFILE_CACHE_NEGATIVE_TTL", 60.0)
+
+# The authenticated user's avatar list (avatars://me)
+AVATARS_CACHE_TTL = _env_float("GRAVATAR_AVATARS_CACHE_TTL", 60.0)
+
+# Seconds past expiry that a cached entry is still served: immediately while it
+# is refreshed in the background, or when the refresh fails (5xx, 429, network)
+PROFILE_STALE_WHILE_REVALIDATE = _env_float("GRAVATAR_PROFILE_STALE_WHILE_REVALIDATE", 300.0)
+PROFILE_STALE_IF_ERROR = _env_float("GRAVATAR_PROFILE_STALE_IF_ERROR", 86400.0)
+AVATAR_STALE_WHILE_REVALIDATE = _env_float("GRAVATAR_AVATAR_STALE_WHILE_REVALIDATE", 3600.0)
+AVATAR_STALE_IF_ERROR = _env_float("GRAVATAR_AVATAR_STALE_IF_ERROR", 86400.0)
+AVATARS_STALE_WHILE_REVALIDATE = _env_float("GRAVATAR_AVATARS_STALE_WHILE_REVALIDATE", 60.0)
+AVATARS_STALE_IF_ERROR = _env_float("GRAVATAR_AVATARS_STALE_IF_ERROR", 3600.0)
+
+# Profile cache shared between server processes, behind the in-process one:
+# "memory://", "sqlite:///path/to/cache.db" or "redis://host:6379/0"; empty disables it
+CACHE_BACKEND = os.environ.get("GRAVATAR_CACHE_BACKEND", "")
+
+# On-disk avatar image cache; set the size budget to 0 to disable it
+AVATAR_CACHE_DIR = os.path.expanduser(os.environ.get("GRAVATAR_AVATAR_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or "~/.cache", "mcp-server-gravatar", "avatars"))
+AVATAR_CACHE_MAX_BYTES = _env_int("GRAVATAR_AVATAR_CACHE_MAX_BYTES", 100 * 1024 * 1024)
+AVATAR_CACHE_TTL = _env_float("GRAVATAR_AVATAR_CACHE_TTL", 3600.0)
+
+# Worker processes used to resize and convert avatar images (requires Pillow)
+IMAGE_WORKERS = _env_int("GRAVATAR_IMAGE_WORKERS", 2)
+
+# Client-side pacing driven by the API's X-RateLimit-* headers
+RATE_LIMIT_RESERVE = _env_int("GRAVATAR_RATE_LIMIT_RESERVE", 1)
+RATE_LIMIT_MAX_WAIT = _env_float("GRAVATAR_RATE_LIMIT_MAX_WAIT", 60.0)
+RATE_LIMIT_MAX_RETRIES = _env_int("GRAVATAR_RATE_LIMIT_MAX_RETRIES", 2)
+
+# Retries of failed idempotent requests (network errors and 5xx responses)
+RETRY_MAX_ATTEMPTS = _env_int("GRAVATAR_RETRY_MAX_ATTEMPTS", 3)
+RETRY_BASE_DELAY = _env_float("GRAVATAR_RETRY_BASE_DELAY", 0.2)
+RETRY_MAX_DELAY = _env_float("GRAVATAR_RETRY_MAX_DELAY", 5.0)
+# Retries earned per request, and the most that can be saved up
+RETRY_BUDGET_RATIO = _env_float("GRAVATAR_RETRY_BUDGET_RATIO", 0.2)
+RETRY_BUDGET_MAX = _env_float("GRAVATAR_RETRY_BUDGET_MAX", 10.0)
+# Per-host circuit breaker
+CIRCUIT_BREAKER_THRESHOLD = _env_int("GRAVATAR_CIRCUIT_BREAKER_THRESHOLD", 5)
+CIRCUIT_BREAKER_RESET_TIMEOUT = _env_float("GRAVATAR_CIRCUIT_BREAKER_RESET_TIMEOUT", 30.0)
+
+# Seconds a tool call or resource read may take, including retries; 0 disables
+# the deadline. Clients can override it per call with `timeout` in `_meta`
+TOOL_TIMEOUT = _env_float("GRAVATAR_TOOL_TIMEOUT", 60.0)
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from .deadline import without_deadline
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Merges concurrent calls that share a key into a single upstream call.
+
+    The first caller for a key starts the work as a task; callers arriving while
+    it is in flight await the same task and receive its result or exception.
+    A cancelled caller does not cancel the shared task for the others, but once
+    every caller has gone the task is cancelled, so abandoned work (e.g. after
+    an MCP cancellation or a deadline) does not keep holding a connection.
+
+    The task runs without the first caller's deadline, so that running out of
+    it does not fail the others; each caller bounds its own wait instead.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[asyncio.Task, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            with without_deadline():
+                task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+                if not task.done():
+                    # Callers arriving from now on start afresh rather than
+                    # join a task that is being cancelled
+                    if self._inflight.get(key) is task:
+                        del self._inflight[key]
+                    task.cancel()
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Retrieve the exception so an unawaited failure is not logged as lost
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import TextIO
+
+SERVER_MODULE = "mcp_server_gravatar.gravatar"
+
+
+def import_times(module: str = SERVER_MODULE) -> list[tuple[str, int]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime`.
+
+    Returns (module name, self time in microseconds) for every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        times.append((name.strip(), int(self_us)))
+    return times
+
+
+def report(out: TextIO = sys.stderr, top: int = 15) -> None:
+    """
+    Print where server startup time goes: imports grouped by top-level
+    package, then building and registering the server in this process.
+    """
+    by_package: dict[str, int] = defaultdict(int)
+    for name, self_us in import_times():
+        by_package[name.split(".", 1)[0]] += self_us
+    total = sum(by_package.values())
+
+    print(f"Import time for {SERVER_MODULE} (fresh interpreter): {total / 1000:.1f} ms", file=out)
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {100 * self_us / total:5.1f}%  {package}", file=out)
+
+    start = time.perf_counter()
+    from . import gravatar
+    imported = time.perf_counter()
+    gravatar.register_tools(gravatar.mcp)
+    gravatar.register_resources(gravatar.mcp)
+    gravatar.register_prompts(gravatar.mcp)
+    registered = time.perf_counter()
+    print(f"Server module import (this process): {(imported - start) * 1000:.1f} ms", file=out)
+    print(f"Tool/resource/prompt registration:   {(registered - imported) * 1000:.1f} ms", file=out)
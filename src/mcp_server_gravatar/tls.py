@@ -0,0 +1,48 @@
+"""
+One verifying SSL context shared by the Gravatar API and image clients.
+"""
+import functools
+import ssl
+from typing import Optional, Union
+
+
+@functools.lru_cache(maxsize=None)
+def _create_ssl_context(
+    cafile: Optional[str],
+    cadata: Optional[Union[str, bytes]],
+    cert_file: Optional[str],
+    key_file: Optional[str],
+    check_hostname: bool,
+) -> ssl.SSLContext:
+    if cafile is None and cadata is None:
+        try:
+            import certifi
+        except ImportError:
+            pass
+        else:
+            cafile = certifi.where()
+    # With neither a CA bundle nor certifi this loads the system store
+    context = ssl.create_default_context(cafile=cafile, cadata=cadata)
+    if cert_file:
+        context.load_cert_chain(cert_file, keyfile=key_file)
+    if not check_hostname:
+        context.check_hostname = False
+    return context
+
+
+def ssl_context(configuration) -> ssl.SSLContext:
+    """
+    Get the SSL context for verified connections made with `configuration`.
+
+    CA certificates come from `ssl_ca_cert` / `ca_cert_data`, otherwise from
+    certifi if it is installed, otherwise from the system store. Loading them
+    is the slow part of setting up TLS, so configurations with equal settings
+    share one context, built on first use.
+    """
+    return _create_ssl_context(
+        configuration.ssl_ca_cert,
+        configuration.ca_cert_data,
+        configuration.cert_file,
+        configuration.key_file,
+        configuration.assert_hostname is not False,
+    )
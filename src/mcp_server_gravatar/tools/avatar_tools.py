@@ -1,7 +1,12 @@
-import httpx
+import asyncio
 import json
+import logging
 from typing import Any
 from fastmcp import FastMCP, Image
+from mcp.types import TextContent
+from .. import images, settings
+
+logger = logging.getLogger(__name__)
 
 
 class AvatarTools:
@@ -11,39 +16,64 @@ class AvatarTools:
         """
         self.client = client
 
-    async def get_avatar_by_id(self, avatar_identifier: str) -> bytes:
+    async def get_avatar_by_id(
+        self,
+        avatar_identifier: str,
+        size: int | None = None,
+        default: str | None = None,
+        rating: str | None = None,
+    ) -> bytes:
         """
         Fetch an avatar as raw data using its avatar_identifier hash
         """
-        if not avatar_identifier:
-            raise ValueError("avatar_identifier must not be empty")
-        async with httpx.AsyncClient(verify=False) as client_http:
-            avatar_url = "https://gravatar.com/avatar/{avatar_identifier}"
-            response = await client_http.get(avatar_url)
-            response.raise_for_status()
-            return response.content
+        avatar_url = images.avatar_url(avatar_identifier, size=size, default=default, rating=rating)
+        return await self.client.get_image(avatar_url)
 
-    async def get_avatar_by_id_as_image(self, avatar_identifier: str) -> Image:
+    async def get_avatar_by_id_as_image(
+        self,
+        avatar_identifier: str,
+        size: int | None = None,
+        default: str | None = None,
+        rating: str | None = None,
+        image_format: str | None = None,
+    ) -> Image:
         """
         Fetch an avatar image using its avatar_identifier hash
         """
-        avatar = await self.get_avatar_by_id(avatar_identifier)
-        return Image(avatar)
+        avatar_url = images.avatar_url(avatar_identifier, size=size, default=default, rating=rating)
+        data, fmt = await self.client.get_image_variant(avatar_url, image_format=image_format)
+        return Image(data=data, format=fmt)
 
-    async def get_avatar_by_email(self, email: str) -> bytes:
+    async def get_avatar_by_email(
+        self,
+        email: str,
+        size: int | None = None,
+        default: str | None = None,
+        rating: str | None = None,
+    ) -> bytes:
         """
         Fetch an avatar as raw data using its email address
         """
         avatar_identifier = self.client.hash_email(email)
-        avatar = await self.get_avatar_by_id(avatar_identifier)
+        avatar = await self.get_avatar_by_id(
+            avatar_identifier, size=size, default=default, rating=rating)
         return avatar
 
-    async def get_avatar_by_email_as_image(self, email: str) -> Image:
+    async def get_avatar_by_email_as_image(
+        self,
+        email: str,
+        size: int | None = None,
+        default: str | None = None,
+        rating: str | None = None,
+        image_format: str | None = None,
+    ) -> Image:
         """
         Fetch an avatar image using its email address
         """
-        avatar = await self.get_avatar_by_email(email)
-        return Image(avatar)
+        avatar_identifier = self.client.hash_email(email)
+        return await self.get_avatar_by_id_as_image(
+            avatar_identifier, size=size, default=default, rating=rating,
+            image_format=image_format)
 
     async def get_avatars(self, selected_email_hash: str | None = None) -> list[dict[str, Any]]:
         """
@@ -56,10 +86,10 @@ class AvatarTools:
             list[dict[str, Any]]: A list of avatar metadata dictionaries.
         """
         if selected_email_hash is not None:
-            avatars = self.client.get_avatars(
+            avatars = await self.client.get_avatars(
                 selected_email_hash=selected_email_hash)
         else:
-            avatars = self.client.get_avatars()
+            avatars = await self.client.get_avatars()
         result = []
         for avatar in avatars:
             if hasattr(avatar, "model_dump"):
@@ -72,53 +102,87 @@ class AvatarTools:
                 result.append(avatar)
         return result
 
-    async def get_avatars_as_images(self, selected_email_hash: str | None = None) -> list[Image]:
+    async def fetch_images(
+        self,
+        urls: list[str],
+        size: int | None = None,
+        image_format: str | None = None,
+    ) -> list[tuple[bytes, str | None] | Exception]:
+        """
+        Download several images concurrently, optionally resized and converted.
+
+        At most `GRAVATAR_AVATAR_FETCH_CONCURRENCY` downloads are in flight at once.
+        Results are (bytes, format) pairs in the same order as `urls`; a failed
+        download is returned as its exception instead of aborting the whole batch.
+        """
+        semaphore = asyncio.Semaphore(settings.AVATAR_FETCH_CONCURRENCY)
+
+        async def fetch(url: str) -> tuple[bytes, str | None]:
+            async with semaphore:
+                return await self.client.get_image_variant(
+                    url, size=size, image_format=image_format)
+
+        return await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+
+    async def get_avatars_as_images(
+        self,
+        selected_email_hash: str | None = None,
+        size: int | None = None,
+        image_format: str | None = None,
+    ) -> list[Image | TextContent]:
         """
         Fetch and return the images for all avatars.
+
+        Avatars that fail to download are reported as a text item in their place.
         """
         avatars = await self.get_avatars(selected_email_hash=selected_email_hash)
-        images: list[Image] = []
-        # TODO: Use a proper CA for SSL certificate validation
-        async with httpx.AsyncClient(verify=False) as client_http:
-            for avatar in avatars:
-                url = avatar.get("image_url")
-                if not url:
-                    continue
-                response = await client_http.get(url)
-                response.raise_for_status()
-                images.append(Image(data=response.content))
-        return images
-
-    async def get_avatars_as_bytes(self, selected_email_hash: str | None = None) -> list[bytes]:
+        urls = [avatar["image_url"] for avatar in avatars if avatar.get("image_url")]
+        results = await self.fetch_images(urls, size=size, image_format=image_format)
+        items: list[Image | TextContent] = []
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                items.append(TextContent(
+                    type="text", text=f"Failed to fetch avatar {url}: {result}"))
+            else:
+                data, fmt = result
+                items.append(Image(data=data, format=fmt))
+        return items
+
+    async def get_avatars_as_bytes(
+        self, selected_email_hash: str | None = None
+    ) -> list[bytes | Exception]:
         """
         Fetch and return the raw image bytes for all avatars.
+
+        Avatars that fail to download are returned as the exception in their place.
         """
         avatars = await self.get_avatars(selected_email_hash=selected_email_hash)
-        images: list[bytes] = []
-        # TODO: Use a proper CA for SSL certificate validation
-        async with httpx.AsyncClient(verify=False) as client_http:
-            for avatar in avatars:
-                url = avatar.get("image_url")
-                if not url:
-                    continue
-                response = await client_http.get(url)
-                response.raise_for_status()
-                images.append(response.content)
-        return images
-
-    async def get_selected_avatar_as_image(self, email: str | None = None) -> list[Image]:
+        urls = [avatar["image_url"] for avatar in avatars if avatar.get("image_url")]
+        results = await self.fetch_images(urls)
+        return [result if isinstance(result, Exception) else result[0] for result in results]
+
+    async def get_selected_avatar_as_image(
+        self,
+        email: str | None = None,
+        size: int | None = None,
+        image_format: str | None = None,
+    ) -> list[Image]:
         """
         Fetch and return images for the selected avatar.
 
         Args:
             email: User's email address to determine which avatar is selected.
+            size: Maximum edge length in pixels; larger images are scaled down.
+            image_format: Output format: "png", "webp" or "jpeg".
 
         Returns:
             list[Image]: A single-element list containing the selected avatar image.
         """
-        avatars_as_bytes = self.get_selected_avatar_as_bytes(email=email)
-        avatars = map(lambda bytes: Image(data=bytes), avatars_as_bytes)
-        return avatars
+        url = await self._selected_avatar_url(email)
+        if url is None:
+            return []
+        data, fmt = await self.client.get_image_variant(url, size=size, image_format=image_format)
+        return [Image(data=data, format=fmt)]
 
     async def get_selected_avatar_as_bytes(self, email: str | None = None) -> list[bytes]:
         """
@@ -130,31 +194,42 @@ class AvatarTools:
         Returns:
             list[bytes]: A single-element list containing the selected avatar image bytes.
         """
+        url = await self._selected_avatar_url(email)
+        if url is None:
+            return []
+        return [await self.client.get_image(url)]
+
+    async def _selected_avatar_url(self, email: str | None) -> str | None:
         # Reuse the metadata tool to get avatar URLs
-        selected_hash = self.client.hash_email(email)
+        selected_hash = self.client.hash_email(email) if email else None
         avatars = await self.get_avatars(selected_email_hash=selected_hash)
-        images: list[bytes] = []
-        # TODO: Use a proper CA for SSL certificate validation
-        async with httpx.AsyncClient(verify=False) as client_http:
-            for avatar in avatars:
-                if not avatar.get("selected"):
-                    continue
-                url = avatar.get("image_url")
-                if not url:
-                    continue
-                response = await client_http.get(url)
-                response.raise_for_status()
-                images.append(response.content)
-                break
-        return images
+        for avatar in avatars:
+            if avatar.get("selected") and avatar.get("image_url"):
+                return avatar["image_url"]
+        return None
 
     def register_tools(self, mcp: FastMCP):
         @mcp.tool()
-        async def get_avatar_by_id_as_image(hash: str) -> Image:
+        async def get_avatar_by_id_as_image(
+            hash: str,
+            size: int | None = None,
+            default: str | None = None,
+            rating: str | None = None,
+            format: str | None = None,
+        ) -> Image:
             """
             Fetch the avatar for a given id as an image.
+
+            Args:
+                hash: SHA256 hash of the email address.
+                size: Edge length in pixels (1-2048), e.g. 64 for a thumbnail.
+                default: Image to use when there is no avatar: "404", "mp", "identicon",
+                    "monsterid", "wavatar", "retro", "robohash", "blank" or a URL.
+                rating: Highest rating to allow: "g", "pg", "r" or "x".
+                format: Output format: "png", "webp" or "jpeg".
             """
-            avatar = await self.get_avatar_by_id_as_image(hash)
+            avatar = await self.get_avatar_by_id_as_image(
+                hash, size=size, default=default, rating=rating, image_format=format)
             return avatar
 
         @mcp.tool()
@@ -166,21 +241,44 @@ class AvatarTools:
             return avatars
 
         @mcp.tool()
-        async def get_avatars_as_images(selected_email_hash: str | None = None) -> list[Image]:
+        async def get_avatars_as_images(
+            selected_email_hash: str | None = None,
+            size: int | None = None,
+            format: str | None = None,
+        ) -> list[Image | TextContent]:
             """
             Fetch all avatars as images.
+
+            Args:
+                selected_email_hash: Optional SHA256 hash of an email to mark that avatar as selected.
+                size: Maximum edge length in pixels; larger images are scaled down.
+                format: Output format: "png", "webp" or "jpeg".
             """
-            avatars = await self.get_avatars_as_images(selected_email_hash)
+            avatars = await self.get_avatars_as_images(
+                selected_email_hash, size=size, image_format=format)
             return avatars
 
         @mcp.tool()
-        async def get_selected_avatar_as_image(email: str | None = None) -> list[Image]:
+        async def get_selected_avatar_as_image(
+            email: str | None = None,
+            size: int | None = None,
+            format: str | None = None,
+        ) -> list[Image]:
             """
             Fetch the selected avatar as an image.
+
+            Args:
+                email: User's email address to determine which avatar is selected.
+                size: Maximum edge length in pixels; larger images are scaled down.
+                format: Output format: "png", "webp" or "jpeg".
             """
-            return await self.get_selected_avatar_as_image(email)
+            return await self.get_selected_avatar_as_image(email, size=size, image_format=format)
 
     def register_resources(self, mcp: FastMCP):
+        # The un-suffixed resources declare image/png, so convert when Pillow is
+        # available; otherwise they are served as Gravatar sends them.
+        legacy_format = "png" if images.pillow_available() else None
+
         @mcp.resource(
             uri="avatar://avatar_identifier/{avatar_identifier}",
             mime_type="image/png"
@@ -189,8 +287,8 @@ class AvatarTools:
             """
             Returns an avatar for a given id.
             """
-            avatar = await self.get_avatar_by_id(avatar_identifier=avatar_identifier)
-            return avatar
+            avatar_url = images.avatar_url(avatar_identifier)
+            return await self._legacy_image(avatar_url, legacy_format)
 
         @mcp.resource(
             uri="avatar://email/{email}",
@@ -200,8 +298,8 @@ class AvatarTools:
             """
             Returns an avatar for a given email address.
             """
-            avatar = await self.get_avatar_by_email(email)
-            return avatar
+            avatar_url = images.avatar_url(self.client.hash_email(email))
+            return await self._legacy_image(avatar_url, legacy_format)
 
         @mcp.resource(
             uri="avatars://me",
@@ -222,13 +320,76 @@ class AvatarTools:
             """
             Returns an avatar of the authenticated user as an image with a given index.
             """
-            avatars = await self.get_avatars()
-            # Guard against invalid index
-            if index < 0 or index >= len(avatars):
-                raise IndexError(
-                    f"Avatar index {index} is out of range (0 to {len(avatars)-1})")
-
-            url = avatars[index]["image_url"]
-            # TODO: handle SSL verification
-            data = (await httpx.AsyncClient(verify=False).get(url)).content
+            url = await self._avatar_url_at_index(index)
+            return await self._legacy_image(url, legacy_format)
+
+        for image_format, mime_type in images.FORMATS.items():
+            self._register_sized_resources(mcp, image_format, mime_type)
+
+    def _register_sized_resources(self, mcp: FastMCP, image_format: str, mime_type: str):
+        """
+        Register `.../{size}.<format>` variants of the avatar resources.
+        """
+        @mcp.resource(
+            uri=f"avatar://avatar_identifier/{{avatar_identifier}}/{{size}}.{image_format}",
+            name=f"get_avatar_by_id_{image_format}",
+            mime_type=mime_type
+        )
+        async def get_avatar_by_id(avatar_identifier: str, size: int) -> bytes:
+            """
+            Returns an avatar for a given id at a given size.
+            """
+            avatar_url = images.avatar_url(avatar_identifier, size=size)
+            data, _ = await self.client.get_image_variant(avatar_url, image_format=image_format)
+            return data
+
+        @mcp.resource(
+            uri=f"avatar://email/{{email}}/{{size}}.{image_format}",
+            name=f"get_avatar_by_email_{image_format}",
+            mime_type=mime_type
+        )
+        async def get_avatar_by_email(email: str, size: int) -> bytes:
+            """
+            Returns an avatar for a given email address at a given size.
+            """
+            avatar_url = images.avatar_url(self.client.hash_email(email), size=size)
+            data, _ = await self.client.get_image_variant(avatar_url, image_format=image_format)
             return data
+
+        @mcp.resource(
+            uri=f"avatars://me/images/{{index}}/{{size}}.{image_format}",
+            name=f"get_avatar_at_index_{image_format}",
+            mime_type=mime_type
+        )
+        async def get_avatar_at_index(index: int, size: int) -> bytes:
+            """
+            Returns an avatar of the authenticated user with a given index, scaled
+            down to at most `size` pixels.
+            """
+            url = await self._avatar_url_at_index(index)
+            data, _ = await self.client.get_image_variant(
+                url, size=size, image_format=image_format)
+            return data
+
+    async def _legacy_image(self, url: str, image_format: str | None) -> bytes:
+        """
+        Fetch an image for the un-suffixed resources, converted to `image_format`
+        if possible and as Gravatar sent it otherwise, as they always were.
+        """
+        data = await self.client.get_image(url)
+        if image_format is None:
+            return data
+        try:
+            converted, _ = await self.client.get_image_variant(url, image_format=image_format)
+        except Exception as e:
+            logger.warning("Serving avatar %s unconverted: %s", url, e)
+            return data
+        return converted
+
+    async def _avatar_url_at_index(self, index: int) -> str:
+        avatars = await self.get_avatars()
+        # Guard against invalid index
+        if index < 0 or index >= len(avatars):
+            raise IndexError(
+                f"Avatar index {index} is out of range (0 to {len(avatars)-1})")
+        return avatars[index]["image_url"]
@@ -0,0 +1,120 @@
+import json
+import time
+from typing import Any, Optional
+from fastmcp import FastMCP
+from ..metrics import Histogram
+
+
+def _latency(histogram: Optional[Histogram]) -> dict[str, Any]:
+    if histogram is None or not histogram.count:
+        return {"count": 0}
+    return {
+        "count": histogram.count,
+        "mean_ms": round(1000 * histogram.sum / histogram.count, 2),
+        "p50_ms": round(1000 * histogram.quantile(0.5), 2),
+        "p95_ms": round(1000 * histogram.quantile(0.95), 2),
+        "p99_ms": round(1000 * histogram.quantile(0.99), 2),
+    }
+
+
+class DiagnosticsTools:
+    def __init__(self, client):
+        """
+        Initialize with a Gravatar API client.
+        """
+        self.client = client
+
+    def get_connection_health(self) -> dict[str, Any]:
+        """
+        Report the state of the client's resilience machinery.
+
+        Returns:
+            dict[str, Any]: Circuit breaker state per host, the retry budget and
+            retry count, the API rate limit budget and DNS cache statistics.
+        """
+        dns_cache = self.client.dns_cache
+        return {
+            **self.client.retrier.stats(),
+            "rate_limit": self.client.rate_limiter.stats(),
+            "dns_cache": dns_cache.stats() if dns_cache is not None else None,
+        }
+
+    def server_stats(self) -> dict[str, Any]:
+        """
+        Summarize the server's metrics since startup.
+
+        Returns:
+            dict[str, Any]: Latency percentiles, call and error counts per MCP
+            tool and resource; latency, statuses, bytes and 429s per upstream
+            endpoint; and hit ratios per cache.
+        """
+        metrics = self.client.metrics
+
+        handlers: dict[str, dict[str, Any]] = {}
+        for labels, histogram in metrics.histograms("gravatar_mcp_request_duration_seconds").items():
+            label = dict(labels)
+            handlers[f"{label['kind']}:{label['name']}"] = {
+                **_latency(histogram),
+                "errors": int(metrics.value("gravatar_mcp_requests_total", outcome="error", **label)),
+                "in_flight": int(metrics.value("gravatar_mcp_requests_in_flight", **label)),
+            }
+
+        upstream: dict[str, dict[str, Any]] = {}
+        for labels, histogram in metrics.histograms("gravatar_upstream_request_duration_seconds").items():
+            endpoint = dict(labels)["endpoint"]
+            upstream[endpoint] = {
+                **_latency(histogram),
+                "statuses": {},
+                "bytes": int(metrics.value("gravatar_upstream_response_bytes_total", endpoint=endpoint)),
+                "rate_limited": int(metrics.value("gravatar_upstream_rate_limited_total", endpoint=endpoint)),
+                "in_flight": int(metrics.value("gravatar_upstream_requests_in_flight", endpoint=endpoint)),
+            }
+        for labels, count in metrics.series("gravatar_upstream_responses_total").items():
+            label = dict(labels)
+            if label["endpoint"] in upstream:
+                upstream[label["endpoint"]]["statuses"][label["status"]] = int(count)
+
+        caches: dict[str, dict[str, Any]] = {}
+        for labels, count in metrics.series("gravatar_cache_lookups_total").items():
+            label = dict(labels)
+            counts = caches.setdefault(label["cache"], {"hit": 0, "stale": 0, "miss": 0})
+            counts[label["result"]] = int(count)
+        for counts in caches.values():
+            lookups = counts["hit"] + counts["stale"] + counts["miss"]
+            # Stale entries are served without waiting on Gravatar, so they count as hits
+            counts["hit_ratio"] = round((counts["hit"] + counts["stale"]) / lookups, 3) if lookups else None
+
+        return {
+            "uptime_seconds": round(time.time() - metrics.started_at, 1),
+            "requests": handlers,
+            "upstream": upstream,
+            "caches": caches,
+        }
+
+    def register_tools(self, mcp: FastMCP):
+        @mcp.tool()
+        async def get_connection_health() -> dict[str, Any]:
+            """
+            Show whether Gravatar is reachable: circuit breaker state per host,
+            remaining retry budget and rate limit budget.
+            """
+            return self.get_connection_health()
+
+        @mcp.tool()
+        async def server_stats() -> dict[str, Any]:
+            """
+            Show the server's latency and throughput since startup: per tool and
+            resource, per Gravatar endpoint, and cache hit ratios.
+            """
+            return self.server_stats()
+
+    def register_resources(self, mcp: FastMCP):
+        @mcp.resource(
+            uri="stats://server",
+            mime_type="application/json"
+        )
+        async def get_server_stats() -> str:
+            """
+            Returns the server's latency, throughput and cache statistics as JSON.
+            """
+            return json.dumps(self.server_stats())
@@ -1,10 +1,14 @@
 from __future__ import annotations
+import asyncio
 from enum import Enum
 import json
 import httpx
-from typing import overload, Literal, Union, Any, Protocol
+from typing import overload, Iterable, Literal, Union, Any, Protocol
 from fastmcp import FastMCP, Context
 from fastmcp.prompts import Message, UserMessage
+from openapi_client.exceptions import ApiException, NotFoundException
+import openapi_client.models
+from .. import settings
 
 
 class ProfileField(Enum):
@@ -37,7 +41,44 @@ class ProfileField(Enum):
     registration_date = "registration_date"
 
 
+# Nested models validated when their field is projected out of a raw profile.
+# Named rather than imported so the models load on first use.
+_FIELD_MODELS = {
+    ProfileField.verified_accounts: "VerifiedAccount",
+    ProfileField.languages: "Language",
+    ProfileField.links: "Link",
+    ProfileField.interests: "Interest",
+    ProfileField.payments: "ProfilePayments",
+    ProfileField.contact_info: "ProfileContactInfo",
+    ProfileField.gallery: "GalleryImage",
+}
+
+
+def project_profile(raw: dict[str, Any], fields: Iterable[ProfileField]) -> dict[str, Any]:
+    """
+    Extract only the requested fields from a raw profile JSON object.
+
+    Only the nested models of the requested fields are validated, so this
+    skips building (and dumping) the full `Profile` model.
+    """
+    projected: dict[str, Any] = {}
+    for field in fields:
+        field = ProfileField(field)
+        value = raw.get(field.value)
+        model_name = _FIELD_MODELS.get(field)
+        if value is not None and model_name is not None:
+            model = getattr(openapi_client.models, model_name)
+            if isinstance(value, list):
+                value = [model.from_dict(item).to_dict() for item in value]
+            else:
+                value = model.from_dict(value).to_dict()
+        projected[field.value] = value
+    return projected
+
+
 class ProfileTools:
+    # Email addresses hashed per worker thread hand-off by hash_emails
+    HASH_CHUNK_SIZE = 10_000
 
     def __init__(self, client):
         """
@@ -50,7 +91,7 @@ class ProfileTools:
         Fetch Gravatar profile for a given email address.
         """
         profile_id = self.client.hash_email(email)
-        profile = self.client.get_profile_by_id(profile_id)
+        profile = await self.client.get_profile_by_id(profile_id)
         if hasattr(profile, "to_dict"):
             return profile.to_dict()
         return profile
@@ -59,7 +100,7 @@ class ProfileTools:
         """
         Fetch Gravatar profile for a given SHA256 hash.
         """
-        profile = self.client.get_profile_by_id(hash)
+        profile = await self.client.get_profile_by_id(hash)
         if hasattr(profile, "to_dict"):
             return profile.to_dict()
         return profile
@@ -113,8 +154,9 @@ class ProfileTools:
         """
         Fetch a specific field from a Gravatar profile by its SHA256 identifier.
         """
-        profile = await self.get_profile_by_hash(profile_identifier)
-        return profile.get(field.value)
+        field = ProfileField(field)
+        fields = await self.get_profile_fields_with_hash(profile_identifier, [field])
+        return fields[field.value]
 
     @overload
     async def get_profile_field_with_email(
@@ -168,6 +210,98 @@ class ProfileTools:
         profile_identifier = self.client.hash_email(email)
         return await self.get_profile_field_with_hash(profile_identifier, field)
 
+    async def get_profile_fields_with_hash(
+        self,
+        profile_identifier: str,
+        fields: Iterable[ProfileField]
+    ) -> dict[str, Any]:
+        """
+        Fetch several fields from a Gravatar profile by its SHA256 identifier.
+        """
+        raw = await self.client.get_profile_json(profile_identifier)
+        return project_profile(raw, fields)
+
+    async def get_profile_fields_with_email(
+        self,
+        email: str,
+        fields: Iterable[ProfileField]
+    ) -> dict[str, Any]:
+        """
+        Fetch several fields from a Gravatar profile by email address.
+        """
+        profile_identifier = self.client.hash_email(email)
+        return await self.get_profile_fields_with_hash(profile_identifier, fields)
+
+    async def get_profiles_batch(
+        self,
+        emails: list[str] | None = None,
+        hashes: list[str] | None = None,
+        fields: list[ProfileField] | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Fetch many Gravatar profiles concurrently.
+
+        Emails are normalized and hashed, and duplicate identifiers are fetched
+        only once. At most `GRAVATAR_PROFILE_BATCH_CONCURRENCY` lookups run at a
+        time, all subject to the client's rate limiter.
+
+        Returns:
+            dict[str, dict[str, Any]]: For each requested email or hash, its
+            profile identifier, a status of "found", "not_found" or "error",
+            and either the profile (restricted to `fields` if given) or the error.
+        """
+        identifiers: dict[str, str] = {}
+        for email in emails or []:
+            identifiers[email] = self.client.hash_email(email)
+        for hash in hashes or []:
+            identifiers[hash] = hash.strip()
+        unique = list(dict.fromkeys(identifiers.values()))
+
+        semaphore = asyncio.Semaphore(settings.PROFILE_BATCH_CONCURRENCY)
+
+        async def fetch(profile_identifier: str) -> dict[str, Any]:
+            async with semaphore:
+                if fields:
+                    return await self.get_profile_fields_with_hash(profile_identifier, fields)
+                return await self.get_profile_by_hash(profile_identifier)
+
+        results = await asyncio.gather(*(fetch(h) for h in unique), return_exceptions=True)
+        by_identifier = dict(zip(unique, results))
+
+        batch: dict[str, dict[str, Any]] = {}
+        for key, profile_identifier in identifiers.items():
+            result = by_identifier[profile_identifier]
+            entry: dict[str, Any] = {"hash": profile_identifier}
+            if isinstance(result, NotFoundException):
+                entry["status"] = "not_found"
+            elif isinstance(result, ApiException):
+                entry["status"] = "error"
+                entry["error"] = f"{result.status} {result.reason}"
+            elif isinstance(result, Exception):
+                entry["status"] = "error"
+                entry["error"] = str(result)
+            else:
+                entry["status"] = "found"
+                entry["profile"] = result
+            batch[key] = entry
+        return batch
+
+    async def hash_emails(self, emails: list[str]) -> list[str]:
+        """
+        Normalize and hash email addresses into Gravatar profile identifiers.
+
+        Hashing runs in a worker thread, in chunks of `HASH_CHUNK_SIZE`
+        addresses, so large lists do not stall other requests.
+
+        Returns:
+            list[str]: The SHA256 hash of each address, in the same order.
+        """
+        hashes: list[str] = []
+        for start in range(0, len(emails), self.HASH_CHUNK_SIZE):
+            chunk = emails[start:start + self.HASH_CHUNK_SIZE]
+            hashes.extend(await asyncio.to_thread(self.client.hash_emails, chunk))
+        return hashes
+
     def register_tools(self, mcp: FastMCP):
         """
         Register all profile-related tools with the MCP server.
@@ -206,6 +340,47 @@ class ProfileTools:
             """
             return await self.get_profile_field_with_email(email, field)
 
+        @mcp.tool()
+        async def get_profile_fields_with_hash(
+            profileIdentifier: str,
+            fields: list[ProfileField]
+        ) -> dict[str, Any]:
+            """
+            Fetch several fields from a Gravatar profile using a profile identifier.
+            """
+            return await self.get_profile_fields_with_hash(profileIdentifier, fields)
+
+        @mcp.tool()
+        async def get_profile_fields_with_email(
+            email: str,
+            fields: list[ProfileField]
+        ) -> dict[str, Any]:
+            """
+            Fetch several fields from a Gravatar profile using the profile identifier of an email address.
+            """
+            return await self.get_profile_fields_with_email(email, fields)
+
+        @mcp.tool()
+        async def get_profiles_batch(
+            emails: list[str] | None = None,
+            hashes: list[str] | None = None,
+            fields: list[ProfileField] | None = None
+        ) -> dict[str, dict[str, Any]]:
+            """
+            Fetch many profiles at once using email addresses and/or profile identifiers.
+            Each entry reports whether the profile was found, not found, or failed.
+            Optionally return only the given fields of each profile.
+            """
+            return await self.get_profiles_batch(emails, hashes, fields)
+
+        @mcp.tool()
+        async def hash_emails(emails: list[str]) -> list[str]:
+            """
+            Convert email addresses to Gravatar profile identifiers (SHA256 hashes).
+            Returns one hash per address, in the same order.
+            """
+            return await self.hash_emails(emails)
+
     def register_resources(self, mcp: FastMCP):
         @mcp.resource(
             uri="profiles://profileIdentifier/{profileIdentifier}",
@@ -16,34 +16,80 @@
 
 __version__ = "1.0.0"
 
-# import apis into sdk package
-from openapi_client.api.avatars_api import AvatarsApi
-from openapi_client.api.profiles_api import ProfilesApi
-
-# import ApiClient
-from openapi_client.api_response import ApiResponse
-from openapi_client.api_client import ApiClient
-from openapi_client.configuration import Configuration
-from openapi_client.exceptions import OpenApiException
-from openapi_client.exceptions import ApiTypeError
-from openapi_client.exceptions import ApiValueError
-from openapi_client.exceptions import ApiKeyError
-from openapi_client.exceptions import ApiAttributeError
-from openapi_client.exceptions import ApiException
-
-# import models into sdk package
-from openapi_client.models.associated_response import AssociatedResponse
-from openapi_client.models.avatar import Avatar
-from openapi_client.models.avatar_rating import AvatarRating
-from openapi_client.models.crypto_wallet_address import CryptoWalletAddress
-from openapi_client.models.error import Error
-from openapi_client.models.gallery_image import GalleryImage
-from openapi_client.models.interest import Interest
-from openapi_client.models.language import Language
-from openapi_client.models.link import Link
-from openapi_client.models.profile import Profile
-from openapi_client.models.profile_contact_info import ProfileContactInfo
-from openapi_client.models.profile_payments import ProfilePayments
-from openapi_client.models.set_email_avatar_request import SetEmailAvatarRequest
-from openapi_client.models.update_avatar_request import UpdateAvatarRequest
-from openapi_client.models.verified_account import VerifiedAccount
+import importlib
+from typing import TYPE_CHECKING
+
+# Imported on first access, so importing the package (e.g. for a single
+# submodule) does not load every API class and model
+_EXPORTS = {
+    "AvatarsApi": "openapi_client.api.avatars_api",
+    "ProfilesApi": "openapi_client.api.profiles_api",
+    "ApiResponse": "openapi_client.api_response",
+    "ApiClient": "openapi_client.api_client",
+    "Configuration": "openapi_client.configuration",
+    "OpenApiException": "openapi_client.exceptions",
+    "ApiTypeError": "openapi_client.exceptions",
+    "ApiValueError": "openapi_client.exceptions",
+    "ApiKeyError": "openapi_client.exceptions",
+    "ApiAttributeError": "openapi_client.exceptions",
+    "ApiException": "openapi_client.exceptions",
+    "AssociatedResponse": "openapi_client.models.associated_response",
+    "Avatar": "openapi_client.models.avatar",
+    "AvatarRating": "openapi_client.models.avatar_rating",
+    "CryptoWalletAddress": "openapi_client.models.crypto_wallet_address",
+    "Error": "openapi_client.models.error",
+    "GalleryImage": "openapi_client.models.gallery_image",
+    "Interest": "openapi_client.models.interest",
+    "Language": "openapi_client.models.language",
+    "Link": "openapi_client.models.link",
+    "Profile": "openapi_client.models.profile",
+    "ProfileContactInfo": "openapi_client.models.profile_contact_info",
+    "ProfilePayments": "openapi_client.models.profile_payments",
+    "SetEmailAvatarRequest": "openapi_client.models.set_email_avatar_request",
+    "UpdateAvatarRequest": "openapi_client.models.update_avatar_request",
+    "VerifiedAccount": "openapi_client.models.verified_account",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from openapi_client.api.avatars_api import AvatarsApi
+    from openapi_client.api.profiles_api import ProfilesApi
+    from openapi_client.api_response import ApiResponse
+    from openapi_client.api_client import ApiClient
+    from openapi_client.configuration import Configuration
+    from openapi_client.exceptions import OpenApiException
+    from openapi_client.exceptions import ApiTypeError
+    from openapi_client.exceptions import ApiValueError
+    from openapi_client.exceptions import ApiKeyError
+    from openapi_client.exceptions import ApiAttributeError
+    from openapi_client.exceptions import ApiException
+    from openapi_client.models.associated_response import AssociatedResponse
+    from openapi_client.models.avatar import Avatar
+    from openapi_client.models.avatar_rating import AvatarRating
+    from openapi_client.models.crypto_wallet_address import CryptoWalletAddress
+    from openapi_client.models.error import Error
+    from openapi_client.models.gallery_image import GalleryImage
+    from openapi_client.models.interest import Interest
+    from openapi_client.models.language import Language
+    from openapi_client.models.link import Link
+    from openapi_client.models.profile import Profile
+    from openapi_client.models.profile_contact_info import ProfileContactInfo
+    from openapi_client.models.profile_payments import ProfilePayments
+    from openapi_client.models.set_email_avatar_request import SetEmailAvatarRequest
+    from openapi_client.models.update_avatar_request import UpdateAvatarRequest
+    from openapi_client.models.verified_account import VerifiedAccount
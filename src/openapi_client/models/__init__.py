@@ -12,20 +12,58 @@
     Do not edit the class manually.
 """  # noqa: E501
 
+import importlib
+from typing import TYPE_CHECKING
 
-# import models into model package
-from openapi_client.models.associated_response import AssociatedResponse
-from openapi_client.models.avatar import Avatar
-from openapi_client.models.avatar_rating import AvatarRating
-from openapi_client.models.crypto_wallet_address import CryptoWalletAddress
-from openapi_client.models.error import Error
-from openapi_client.models.gallery_image import GalleryImage
-from openapi_client.models.interest import Interest
-from openapi_client.models.language import Language
-from openapi_client.models.link import Link
-from openapi_client.models.profile import Profile
-from openapi_client.models.profile_contact_info import ProfileContactInfo
-from openapi_client.models.profile_payments import ProfilePayments
-from openapi_client.models.set_email_avatar_request import SetEmailAvatarRequest
-from openapi_client.models.update_avatar_request import UpdateAvatarRequest
-from openapi_client.models.verified_account import VerifiedAccount
+# Imported on first access, so importing the package (e.g. for a single
+# submodule) does not load every API class and model
+_EXPORTS = {
+    "AssociatedResponse": "openapi_client.models.associated_response",
+    "Avatar": "openapi_client.models.avatar",
+    "AvatarRating": "openapi_client.models.avatar_rating",
+    "CryptoWalletAddress": "openapi_client.models.crypto_wallet_address",
+    "Error": "openapi_client.models.error",
+    "GalleryImage": "openapi_client.models.gallery_image",
+    "Interest": "openapi_client.models.interest",
+    "Language": "openapi_client.models.language",
+    "Link": "openapi_client.models.link",
+    "Profile": "openapi_client.models.profile",
+    "ProfileContactInfo": "openapi_client.models.profile_contact_info",
+    "ProfilePayments": "openapi_client.models.profile_payments",
+    "SetEmailAvatarRequest": "openapi_client.models.set_email_avatar_request",
+    "UpdateAvatarRequest": "openapi_client.models.update_avatar_request",
+    "VerifiedAccount": "openapi_client.models.verified_account",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from openapi_client.models.associated_response import AssociatedResponse
+    from openapi_client.models.avatar import Avatar
+    from openapi_client.models.avatar_rating import AvatarRating
+    from openapi_client.models.crypto_wallet_address import CryptoWalletAddress
+    from openapi_client.models.error import Error
+    from openapi_client.models.gallery_image import GalleryImage
+    from openapi_client.models.interest import Interest
+    from openapi_client.models.language import Language
+    from openapi_client.models.link import Link
+    from openapi_client.models.profile import Profile
+    from openapi_client.models.profile_contact_info import ProfileContactInfo
+    from openapi_client.models.profile_payments import ProfilePayments
+    from openapi_client.models.set_email_avatar_request import SetEmailAvatarRequest
+    from openapi_client.models.update_avatar_request import UpdateAvatarRequest
+    from openapi_client.models.verified_account import VerifiedAccount
@@ -0,0 +1,93 @@
+import json
+
+import httpx
+import pytest
+
+from mcp_server_gravatar.async_api_client import AsyncApiClient
+from mcp_server_gravatar.async_rest import AsyncRESTResponse
+from mcp_server_gravatar.gravatar_client import (
+    GET_AVATARS_RESPONSE_TYPES,
+    GET_PROFILE_BY_ID_RESPONSE_TYPES,
+)
+
+AVATARS = [
+    {
+        "image_id": "6f3eac1c67f970f2a0c2ea8",
+        "image_url": "https://2.gravatar.com/userimage/133992/6f3eac1c67f970f2a0c2ea8",
+        "rating": "G",
+        "alt_text": "Gravatar's avatar image.",
+        "selected": True,
+        "updated_date": "2024-09-18T10:17:53Z",
+    },
+    # Optional fields left out, as the API does for unselected avatars
+    {
+        "image_id": "a1b2c3",
+        "image_url": "https://2.gravatar.com/userimage/133992/a1b2c3",
+        "rating": "PG",
+        "alt_text": "",
+        "updated_date": "2024-09-19T08:00:00Z",
+    },
+]
+
+PROFILE = {
+    "hash": "31c5543c1734d25c7206f5fd591525d0295bec6fe84ff82f946a34fe970a1e66",
+    "display_name": "Alex Morgan",
+    "profile_url": "https://gravatar.com/example",
+    "avatar_url": "https://0.gravatar.com/avatar/31c5543c1734d25c7206f5fd591525d0",
+    "avatar_alt_text": "Alex Morgan's avatar",
+    "location": "New York, USA",
+    "description": "I like playing hide and seek.",
+    "job_title": "Landscape Architect",
+    "company": "ACME Corp",
+    "verified_accounts": [
+        {
+            "service_type": "mastodon",
+            "service_label": "Mastodon",
+            "service_icon": "https://gravatar.com/icons/mastodon.svg",
+            "url": "https://mastodon.social/@example",
+            "is_hidden": False,
+        }
+    ],
+    "pronunciation": "Al-ex Mor-gan",
+    "pronouns": "she/her",
+}
+
+
+def _response(payload) -> AsyncRESTResponse:
+    body = json.dumps(payload).encode()
+    response = AsyncRESTResponse(httpx.Response(
+        200, content=body, headers={"content-type": "application/json; charset=utf-8"}))
+    response.data = body
+    return response
+
+
+def _dump(data):
+    if isinstance(data, list):
+        return [_dump(item) for item in data]
+    if hasattr(data, "model_dump"):
+        return data.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    return data
+
+
+@pytest.mark.parametrize("payload, types_map", [
+    (AVATARS, GET_AVATARS_RESPONSE_TYPES),
+    (PROFILE, GET_PROFILE_BY_ID_RESPONSE_TYPES),
+    (PROFILE, {"200": "Profile"}),
+])
+def test_fast_path_matches_generated_deserialization(payload, types_map):
+    client = AsyncApiClient()
+    client.fast_deserialize = False
+    generic = client.response_deserialize(_response(payload), types_map).data
+    client.fast_deserialize = True
+    fast = client.response_deserialize(_response(payload), types_map).data
+
+    assert fast == generic
+    # Tools dump with exclude_unset=True; missing optional fields stay as None
+    assert _dump(fast) == _dump(generic)
+
+
+def test_fast_path_keeps_missing_optional_fields():
+    client = AsyncApiClient()
+    avatars = client.response_deserialize(_response(AVATARS), GET_AVATARS_RESPONSE_TYPES).data
+
+    assert _dump(avatars)[1]["selected"] is None
@@ -0,0 +1,53 @@
+from mcp_server_gravatar.cache import MISSING, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_the_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=60, clock=clock)
+    cache.set("alice", {"name": "Alice"})
+    clock.now = 59
+    assert cache.get("alice") == {"name": "Alice"}
+    clock.now = 60
+    assert cache.get("alice") is MISSING
+    # Still available for revalidation
+    entry = cache.peek("alice")
+    assert entry.value == {"name": "Alice"}
+    assert cache.staleness(entry) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60, clock=FakeClock())
+    cache.set("alice", 1)
+    cache.set("bob", 2)
+    cache.get("alice")
+    cache.set("carol", 3)
+    assert len(cache) == 2
+    assert cache.get("bob") is MISSING
+    assert cache.get("alice") == 1
+    assert cache.get("carol") == 3
+
+
+def test_negative_entries_use_their_own_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=300, clock=clock)
+    not_found = object()
+    cache.set("nobody", not_found, ttl=30)
+    cache.set("alice", 1)
+    clock.now = 30
+    assert cache.get("nobody") is MISSING
+    assert cache.get("alice") == 1
+
+
+def test_zero_maxsize_disables_the_cache():
+    cache = TTLCache(maxsize=0, ttl=60, clock=FakeClock())
+    cache.set("alice", 1)
+    assert cache.get("alice") is MISSING
+    assert len(cache) == 0
@@ -0,0 +1,82 @@
+import asyncio
+
+from mcp_server_gravatar.cache_backends import RedisCacheBackend, SharedEntry
+
+
+class FakeRedis:
+    """
+    Minimal RESP server for GET and SET; replies to GET of "gravatar:slow" late.
+    """
+
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.data: dict[bytes, bytes] = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                args = []
+                for _ in range(int(header[1:])):
+                    length = int((await reader.readline())[1:])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                command = args[0].upper()
+                if command == b"SET":
+                    self.data[args[1]] = args[2]
+                    writer.write(b"+OK\r\n")
+                elif command == b"GET":
+                    if args[1] == b"gravatar:slow":
+                        await asyncio.sleep(self.delay)
+                    value = self.data.get(args[1])
+                    if value is None:
+                        writer.write(b"$-1\r\n")
+                    else:
+                        writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                else:
+                    writer.write(b"-ERR unknown command\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def _entry(name: str) -> SharedEntry:
+    return SharedEntry(value={"name": name}, expires_at=2e9)
+
+
+def test_redis_cancelled_get_does_not_leak_its_reply():
+    async def scenario():
+        server = FakeRedis()
+        backend = RedisCacheBackend(port=await server.start())
+        try:
+            await backend.set("slow", _entry("slow"), 60)
+            await backend.set("alice", _entry("alice"), 60)
+
+            get = asyncio.ensure_future(backend.get("slow"))
+            await asyncio.sleep(0.05)
+            get.cancel()
+            await asyncio.gather(get, return_exceptions=True)
+            # Let the late reply arrive on the old connection
+            await asyncio.sleep(server.delay * 2)
+
+            alice = await backend.get("alice")
+            nobody = await backend.get("nobody")
+        finally:
+            await backend.close()
+            await server.stop()
+        assert alice is not None and alice.value == {"name": "alice"}
+        assert nobody is None
+
+    asyncio.run(scenario())
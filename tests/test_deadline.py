@@ -0,0 +1,33 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server_gravatar.deadline import DeadlineExceeded, _with_deadline
+
+
+class FakeMCP:
+    def __init__(self, meta):
+        self.meta = meta
+
+    def get_context(self):
+        return SimpleNamespace(request_context=SimpleNamespace(meta=self.meta))
+
+
+async def _tool():
+    await asyncio.sleep(0.01)
+    return "done"
+
+
+@pytest.mark.parametrize("timeout", [0, -1])
+def test_requested_timeout_of_zero_or_less_means_no_deadline(timeout):
+    wrapped = _with_deadline(_tool, FakeMCP(SimpleNamespace(timeout=timeout)), 0.001, "tool")
+    assert asyncio.run(wrapped()) == "done"
+
+
+def test_default_timeout_applies_without_a_request_override():
+    wrapped = _with_deadline(_tool, FakeMCP(None), 0.001, "tool")
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(wrapped())
+    wrapped = _with_deadline(_tool, FakeMCP(SimpleNamespace(timeout=5)), 0.001, "tool")
+    assert asyncio.run(wrapped()) == "done"
@@ -0,0 +1,36 @@
+import os
+import time
+
+from mcp_server_gravatar.disk_cache import DiskCache
+
+URL = "https://gravatar.com/avatar/abc"
+
+
+def test_disabled_cache_serves_nothing(tmp_path):
+    DiskCache(tmp_path, max_bytes=100, ttl=60).set(URL, b"x" * 10)
+    assert DiskCache(tmp_path, max_bytes=0, ttl=60).get(URL) is None
+
+
+def test_processes_sharing_a_directory_stay_within_budget(tmp_path):
+    first = DiskCache(tmp_path, max_bytes=100, ttl=60)
+    second = DiskCache(tmp_path, max_bytes=100, ttl=60)
+    for i in range(10):
+        (first if i % 2 else second).set(f"{URL}?s={i}", b"x" * 30)
+    sizes = [f.stat().st_size for f in tmp_path.rglob("*.bin")]
+    assert sum(sizes) <= 100
+    # The most recent writes are kept
+    assert first.get(f"{URL}?s=9") is not None
+    assert first.get(f"{URL}?s=0") is None
+
+
+def test_abandoned_temporary_files_are_removed(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=100, ttl=60)
+    f, old = cache.create_temp(URL)
+    f.close()
+    past = time.time() - DiskCache.TEMP_MAX_AGE - 1
+    os.utime(old, (past, past))
+    f, recent = cache.create_temp(URL)
+    f.close()
+    cache.set(URL, b"x")
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import httpcore
+
+from mcp_server_gravatar.dns_cache import DNSCache, DNSCachingBackend, _interleave_families
+
+
+class FakeStream(httpcore.AsyncNetworkStream):
+    def __init__(self, address: str):
+        self.address = address
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):
+    """
+    Connects after the delay given for each address; addresses without one fail.
+    """
+
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.attempts: list[str] = []
+        self.cancelled: list[str] = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.attempts.append(host)
+        if host not in self.delays:
+            raise httpcore.ConnectError(f"{host} refused")
+        try:
+            await asyncio.sleep(self.delays[host])
+        except asyncio.CancelledError:
+            self.cancelled.append(host)
+            raise
+        return FakeStream(host)
+
+
+def _backend(addresses: list[str], delays: dict[str, float]) -> tuple[DNSCachingBackend, FakeBackend]:
+    cache = DNSCache(ttl=60)
+
+    async def lookup(host, port):
+        cache._entries[(host, port)] = (addresses, time.monotonic() + cache.ttl)
+        return addresses
+
+    cache._lookup = lookup
+    fake = FakeBackend(delays)
+    return DNSCachingBackend(cache, fake, happy_eyeballs_delay=0.05), fake
+
+
+def test_interleave_families():
+    addresses = ["2001:db8::1", "2001:db8::2", "192.0.2.1", "192.0.2.2", "192.0.2.3"]
+    assert _interleave_families(addresses) == [
+        "2001:db8::1", "192.0.2.1", "2001:db8::2", "192.0.2.2", "192.0.2.3"]
+
+
+def test_unreachable_address_does_not_wait_for_the_timeout():
+    backend, fake = _backend(["2001:db8::1", "192.0.2.1"], {"2001:db8::1": 10, "192.0.2.1": 0})
+
+    async def scenario():
+        start = time.perf_counter()
+        stream = await backend.connect_tcp("example.com", 443, timeout=10)
+        return stream, time.perf_counter() - start
+
+    stream, elapsed = asyncio.run(scenario())
+    assert stream.address == "192.0.2.1"
+    assert elapsed < 1
+    assert fake.cancelled == ["2001:db8::1"]
+
+
+def test_failed_attempt_starts_the_next_one_at_once():
+    backend, fake = _backend(["2001:db8::1", "192.0.2.1"], {"192.0.2.1": 0})
+    backend.happy_eyeballs_delay = 10
+
+    async def scenario():
+        return await asyncio.wait_for(backend.connect_tcp("example.com", 443), 1)
+
+    assert asyncio.run(scenario()).address == "192.0.2.1"
+    assert fake.attempts == ["2001:db8::1", "192.0.2.1"]
+
+
+def test_every_address_failing_raises_and_forgets_the_host():
+    backend, fake = _backend(["2001:db8::1", "192.0.2.1"], {})
+
+    async def scenario():
+        try:
+            await backend.connect_tcp("example.com", 443)
+        except httpcore.ConnectError:
+            return True
+        return False
+
+    assert asyncio.run(scenario())
+    assert fake.attempts == ["2001:db8::1", "192.0.2.1"]
+    assert backend.cache.stats()["size"] == 0
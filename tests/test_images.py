@@ -0,0 +1,47 @@
+import asyncio
+import io
+
+import pytest
+
+from mcp_server_gravatar import images
+from mcp_server_gravatar.tools.avatar_tools import AvatarTools
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _encode(image, image_format: str) -> bytes:
+    out = io.BytesIO()
+    image.save(out, format=image_format)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize("image_format", ["png", "webp", "jpeg"])
+def test_transform_converts_cmyk(image_format):
+    data = _encode(Image.new("CMYK", (8, 8), (0, 128, 255, 0)), "JPEG")
+    converted = images.transform(data, 4, image_format)
+    assert images.sniff_format(converted) == image_format
+    with Image.open(io.BytesIO(converted)) as image:
+        assert image.size == (4, 4)
+        assert image.mode in ("RGB", "L")
+
+
+def test_transform_keeps_palette_transparency():
+    source = Image.new("P", (8, 8))
+    source.info["transparency"] = 0
+    converted = images.transform(_encode(source, "PNG"), None, "webp")
+    with Image.open(io.BytesIO(converted)) as image:
+        assert image.mode == "RGBA"
+
+
+class FailingConversionClient:
+    async def get_image(self, url: str) -> bytes:
+        return b"original"
+
+    async def get_image_variant(self, url, size=None, image_format=None):
+        raise OSError("cannot write mode CMYK as PNG")
+
+
+def test_legacy_resources_serve_the_original_when_conversion_fails():
+    tools = AvatarTools(FailingConversionClient())
+    data = asyncio.run(tools._legacy_image("https://gravatar.com/avatar/abc", "png"))
+    assert data == b"original"
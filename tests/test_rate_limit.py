@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from mcp_server_gravatar.deadline import deadline
+from mcp_server_gravatar.rate_limit import RateLimiter
+from openapi_client.exceptions import ApiException
+
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = NOW
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(**kwargs) -> tuple[RateLimiter, FakeClock]:
+    clock = FakeClock()
+    return RateLimiter(jitter=0, clock=clock, **kwargs), clock
+
+
+def _headers(limit: int, remaining: int, reset: float) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(reset)),
+    }
+
+
+def test_requests_pass_while_the_budget_is_healthy():
+    limiter, clock = _limiter()
+    asyncio.run(limiter.acquire())
+    limiter.update(_headers(100, 50, NOW + 60))
+    asyncio.run(limiter.acquire())
+    assert limiter.remaining == 49
+    assert limiter._delay(clock.now) == 0
+
+
+def test_requests_are_paced_below_the_threshold():
+    limiter, clock = _limiter(pace_below=0.1)
+    limiter.update(_headers(100, 6, NOW + 50))
+    asyncio.run(limiter.acquire())
+    # 5 requests left over 50 seconds: one every 10 seconds
+    assert limiter._delay(clock.now) == pytest.approx(10)
+    # The interval is spread over the time left: 46 / 5 seconds since the last grant
+    clock.now += 4
+    assert limiter._delay(clock.now) == pytest.approx(46 / 5 - 4)
+
+
+def test_requests_queue_at_the_reserve():
+    limiter, clock = _limiter(reserve=2)
+    limiter.update(_headers(100, 2, NOW + 30))
+    assert limiter._delay(clock.now) == pytest.approx(30)
+
+
+def test_rate_limited_waits_for_the_reset_header():
+    limiter, clock = _limiter()
+    limiter.on_rate_limited(_headers(100, 0, NOW + 30))
+    assert limiter.remaining == 0
+    assert limiter.reset_at == NOW + 30
+    assert limiter.rate_limited == 1
+
+
+@pytest.mark.parametrize("headers", [{}, {"X-RateLimit-Reset": str(int(NOW - 5))}])
+def test_rate_limited_without_a_usable_reset_backs_off_briefly(headers):
+    limiter, clock = _limiter()
+    limiter.on_rate_limited(headers)
+    assert limiter.reset_at == NOW + 1
+
+
+def test_new_window_restores_the_budget():
+    limiter, clock = _limiter()
+    limiter.on_rate_limited(_headers(100, 0, NOW + 30))
+    clock.now += 30
+    assert limiter._delay(clock.now) == 0
+    assert limiter.remaining == 100
+    assert limiter.reset_at is None
+
+
+def test_wait_longer_than_max_wait_fails_fast():
+    limiter, clock = _limiter(max_wait=60)
+    limiter.on_rate_limited(_headers(100, 0, NOW + 120))
+    with pytest.raises(ApiException) as e:
+        asyncio.run(limiter.acquire())
+    assert e.value.status == 429
+
+
+def test_wait_past_the_deadline_fails_fast():
+    limiter, clock = _limiter(max_wait=60)
+    limiter.on_rate_limited(_headers(100, 0, NOW + 5))
+
+    async def scenario():
+        with deadline(1):
+            await limiter.acquire()
+
+    with pytest.raises(ApiException) as e:
+        asyncio.run(scenario())
+    assert e.value.status == 429
@@ -0,0 +1,176 @@
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_server_gravatar.deadline import deadline
+from mcp_server_gravatar.retry import (
+    CircuitBreaker, CircuitOpenError, Retrier, RetryBudget, RetryPolicy)
+
+URL = "https://api.gravatar.com/v3/profiles/abc"
+
+
+def _timing_out(calls: list):
+    async def fetch():
+        calls.append(None)
+        raise httpx.ReadTimeout("timed out")
+    return fetch
+
+
+def test_timeout_shortened_by_the_deadline_is_not_a_host_failure():
+    retrier = Retrier(RetryPolicy(base_delay=0), RetryBudget(), failure_threshold=1)
+    calls = []
+
+    async def scenario():
+        with deadline(0.05):
+            await retrier.call("GET", URL, _timing_out(calls), timeout=10)
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(scenario())
+    assert len(calls) == 1
+    assert retrier.breaker("api.gravatar.com").state == CircuitBreaker.CLOSED
+
+
+def test_timeout_within_the_request_timeout_is_a_host_failure():
+    retrier = Retrier(RetryPolicy(max_attempts=1), RetryBudget(), failure_threshold=1)
+    calls = []
+
+    async def scenario():
+        with deadline(60):
+            await retrier.call("GET", URL, _timing_out(calls), timeout=10)
+
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(scenario())
+    assert retrier.breaker("api.gravatar.com").state == CircuitBreaker.OPEN
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _retrier(clock=None, max_attempts=3, budget=None, failure_threshold=5) -> Retrier:
+    return Retrier(
+        RetryPolicy(max_attempts=max_attempts, base_delay=0),
+        budget or RetryBudget(),
+        failure_threshold=failure_threshold,
+        reset_timeout=10,
+        clock=clock or FakeClock(),
+    )
+
+
+def _failing(calls: list, exc: Exception):
+    async def fetch():
+        calls.append(None)
+        raise exc
+    return fetch
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker("api.gravatar.com", failure_threshold=2, reset_timeout=10, clock=clock)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now += 10
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["times_opened"] == 1
+    breaker.before_request()
+
+
+def test_failed_probe_reopens_the_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker("api.gravatar.com", failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["retry_after"] == 10
+
+
+def test_non_retryable_error_releases_the_probe():
+    clock = FakeClock()
+    retrier = _retrier(clock, failure_threshold=1)
+    breaker = retrier.breaker("api.gravatar.com")
+    breaker.record_failure()
+    clock.now += 10
+    calls = []
+    with pytest.raises(ValueError):
+        asyncio.run(retrier.call("GET", URL, _failing(calls, ValueError("bad request body"))))
+    assert len(calls) == 1
+    # Neither closed nor reopened, and the next request may probe
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+
+
+def test_client_error_counts_as_a_healthy_host():
+    retrier = _retrier()
+    breaker = retrier.breaker("api.gravatar.com")
+    breaker.record_failure()
+    request = httpx.Request("GET", URL)
+    error = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request))
+    calls = []
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(retrier.call("GET", URL, _failing(calls, error)))
+    assert len(calls) == 1
+    assert breaker.failures == 0
+
+
+def test_exhausted_budget_stops_retries():
+    budget = RetryBudget(ratio=0, max_tokens=1)
+    retrier = _retrier(max_attempts=5, budget=budget)
+    calls = []
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retrier.call("GET", URL, _failing(calls, httpx.ConnectError("refused"))))
+    assert len(calls) == 2
+    assert retrier.retries == 1
+    assert budget.stats()["exhausted"] == 1
+
+
+def test_non_idempotent_methods_are_not_retried():
+    retrier = _retrier()
+    calls = []
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(retrier.call("POST", URL, _failing(calls, httpx.ConnectError("refused"))))
+    assert len(calls) == 1
+    assert retrier.retries == 0
+
+
+def test_server_error_status_is_retried():
+    retrier = _retrier()
+    statuses = [503, 200]
+
+    async def fetch():
+        return statuses.pop(0)
+
+    assert asyncio.run(retrier.call("GET", URL, fetch, status_of=lambda status: status)) == 200
+    assert retrier.retries == 1
+    assert retrier.breaker("api.gravatar.com").failures == 0
+
+
+def test_last_server_error_is_returned_when_attempts_run_out():
+    retrier = _retrier(max_attempts=2)
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        return 502
+
+    assert asyncio.run(retrier.call("GET", URL, fetch, status_of=lambda status: status)) == 502
+    assert len(calls) == 2
+    assert retrier.breaker("api.gravatar.com").failures == 2
@@ -0,0 +1,75 @@
+import asyncio
+
+from mcp_server_gravatar.deadline import deadline, remaining
+from mcp_server_gravatar.singleflight import SingleFlight
+
+
+def test_caller_after_abandonment_starts_a_new_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(len(calls))
+            try:
+                await asyncio.sleep(0.05)
+            except asyncio.CancelledError:
+                # e.g. closing a connection on the way out
+                await asyncio.sleep(0.05)
+                raise
+            return len(calls)
+
+        first = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.gather(first, return_exceptions=True)
+        # The abandoned call is still unwinding here
+        second = await flight.do("key", fetch)
+        return second, calls, len(flight)
+
+    second, calls, inflight = asyncio.run(scenario())
+    assert second == 2
+    assert calls == [0, 1]
+    assert inflight == 0
+
+
+def test_waiters_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(None)
+            await asyncio.sleep(0.01)
+            return "profile"
+
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)))
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["profile"] * 3
+    assert len(calls) == 1
+
+
+def test_waiters_keep_their_own_deadlines():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.2)
+            # Raises if the shared call inherited the first caller's deadline
+            remaining()
+            return "profile"
+
+        async def call(timeout):
+            with deadline(timeout):
+                return await asyncio.wait_for(flight.do("key", fetch), timeout)
+
+        first = asyncio.ensure_future(call(0.05))
+        await asyncio.sleep(0)
+        second = await call(5)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert isinstance(first.exception(), asyncio.TimeoutError)
+    assert second == "profile"